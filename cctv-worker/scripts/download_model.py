@@ -33,6 +33,148 @@ def download_model(model_name: str = "yolo11n.pt") -> Path:
     return model_path
 
 
+def _letterbox(image, imgsz: int):
+    """Resize + pad to imgsz x imgsz the way Ultralytics preprocesses."""
+    import cv2
+    import numpy as np
+
+    h, w = image.shape[:2]
+    scale = min(imgsz / h, imgsz / w)
+    new_w, new_h = round(w * scale), round(h * scale)
+    resized = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+
+    canvas = np.full((imgsz, imgsz, 3), 114, dtype=np.uint8)
+    top, left = (imgsz - new_h) // 2, (imgsz - new_w) // 2
+    canvas[top:top + new_h, left:left + new_w] = resized
+    return canvas
+
+
+def quantize_onnx_int8(onnx_path: Path, calib_dir: Path, imgsz: int = 640,
+                       max_images: int = 100) -> Path:
+    """Statically quantize an exported YOLO ONNX model to INT8 (QDQ).
+
+    Activation ranges are calibrated on real camera frames (e.g. the
+    snapshots in data/snapshots), so the person class keeps its accuracy
+    on our scenes. The result runs with INT8 kernels (VNNI on x86,
+    dotprod on ARM) in ONNX Runtime's CPU provider.
+
+    Args:
+        onnx_path: FP32 model from export_model(..., "onnx")
+        calib_dir: Directory with .jpg/.png calibration frames
+        imgsz: Model input size
+        max_images: Maximum number of calibration frames
+
+    Returns:
+        Path to the quantized ``{stem}_int8.onnx`` model
+    """
+    import cv2
+    import numpy as np
+    import onnx
+    from onnxruntime.quantization import (
+        CalibrationDataReader, QuantFormat, QuantType, quantize_static
+    )
+
+    images = sorted(
+        p for p in Path(calib_dir).iterdir()
+        if p.suffix.lower() in (".jpg", ".jpeg", ".png")
+    )[:max_images]
+    if not images:
+        raise ValueError(f"No calibration images found in {calib_dir}")
+
+    input_name = onnx.load(str(onnx_path), load_external_data=False).graph.input[0].name
+
+    class FrameReader(CalibrationDataReader):
+        def __init__(self):
+            self._paths = iter(images)
+
+        def get_next(self):
+            for path in self._paths:
+                frame = cv2.imread(str(path))
+                if frame is None:
+                    continue
+                rgb = cv2.cvtColor(_letterbox(frame, imgsz), cv2.COLOR_BGR2RGB)
+                tensor = rgb.transpose(2, 0, 1)[None].astype(np.float32) / 255.0
+                return {input_name: tensor}
+            return None
+
+    output_path = onnx_path.with_name(f"{onnx_path.stem}_int8.onnx")
+    print(f"Calibrating INT8 quantization on {len(images)} frames...")
+    quantize_static(
+        str(onnx_path),
+        str(output_path),
+        FrameReader(),
+        quant_format=QuantFormat.QDQ,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        per_channel=True
+    )
+
+    # Ultralytics reads class names/stride/imgsz from the model metadata
+    source = onnx.load(str(onnx_path), load_external_data=False)
+    quantized = onnx.load(str(output_path))
+    quantized.ClearField("metadata_props")
+    quantized.metadata_props.extend(source.metadata_props)
+    onnx.save(quantized, str(output_path))
+
+    return output_path
+
+
+def export_model(model_name: str = "yolo11n.pt", fmt: str = "engine",
+                 imgsz: int = 640, batch: int = 8,
+                 calib_dir: Path = Path("data/snapshots")) -> Path:
+    """Export a YOLO model for faster inference.
+
+    PersonDetector picks the export up automatically when it sits next
+    to the .pt file.
+
+    Args:
+        model_name: Source .pt model
+        fmt: "engine" (TensorRT FP16, NVIDIA GPU) or
+             "openvino" (INT8, CPU with VNNI) or "onnx" (FP32, portable) or
+             "onnx-int8" (INT8 ONNX Runtime, calibrated on calib_dir)
+        imgsz: Inference size (matches the debug stream's 640px input)
+        batch: Max batch size (matches the batch inference server)
+        calib_dir: Calibration frames for "onnx-int8"
+
+    Returns:
+        Path to exported model
+    """
+    from ultralytics import YOLO
+
+    model = YOLO(model_name)
+    print(f"Exporting {model_name} to {fmt}...")
+
+    if fmt == "engine":
+        exported = model.export(
+            format="engine", half=True, workspace=2, imgsz=imgsz,
+            dynamic=True, batch=batch
+        )
+    elif fmt == "openvino":
+        # INT8 post-training quantization (calibrated on coco8 by default)
+        exported = model.export(
+            format="openvino", int8=True, imgsz=imgsz, dynamic=True, batch=batch
+        )
+    elif fmt == "onnx":
+        exported = model.export(
+            format="onnx", simplify=True, imgsz=imgsz, dynamic=True, batch=batch
+        )
+    elif fmt == "onnx-int8":
+        had_fp32 = Path(model_name).with_suffix(".onnx").exists()
+        onnx_path = Path(model.export(
+            format="onnx", simplify=True, imgsz=imgsz, dynamic=True, batch=batch
+        ))
+        exported = quantize_onnx_int8(onnx_path, calib_dir, imgsz)
+        # The FP32 graph is only an intermediate; left next to the .pt it
+        # would be loaded as a plain ONNX export
+        if not had_fp32:
+            onnx_path.unlink(missing_ok=True)
+    else:
+        raise ValueError(f"Unsupported export format: {fmt}")
+
+    print(f"Exported: {exported}")
+    return Path(exported)
+
+
 def main():
     import argparse
 
@@ -42,9 +184,23 @@ def main():
         default="yolo11n.pt",
         help="Model name (default: yolo11n.pt)"
     )
+    parser.add_argument(
+        "--export",
+        choices=["engine", "openvino", "onnx", "onnx-int8"],
+        help="Also export for faster inference "
+             "(engine: TensorRT FP16 on GPU, openvino/onnx-int8: INT8 on CPU)"
+    )
+    parser.add_argument(
+        "--calib-dir",
+        type=Path,
+        default=Path("data/snapshots"),
+        help="Camera frames for onnx-int8 calibration (default: data/snapshots)"
+    )
     args = parser.parse_args()
 
     download_model(args.model)
+    if args.export:
+        export_model(args.model, args.export, calib_dir=args.calib_dir)
 
     print("\nAvailable models:")
     print("  - yolo11n.pt  (fastest, ~6MB)")
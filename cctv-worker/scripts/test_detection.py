@@ -4,8 +4,8 @@ import os
 import sys
 from pathlib import Path
 
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
 
 def test_single_channel(channel: int = 12):
@@ -31,9 +31,9 @@ def test_single_channel(channel: int = 12):
     print("-" * 50)
 
     # Import modules
-    from utils.rtsp_client import RTSPClient
-    from core.detector import PersonDetector
-    from core.roi_matcher import ROIMatcher
+    from src.utils.rtsp_client import RTSPClient
+    from src.core.detector import PersonDetector
+    from src.core.roi_matcher import ROIMatcher
 
     # Load ROI config
     roi_config_path = Path(__file__).parent.parent / f"data/roi_configs/channel_{channel}.json"
@@ -4,10 +4,14 @@ This module provides real-time MJPEG streaming with YOLO detection
 bounding boxes overlaid on the video feed for debugging purposes.
 """
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import HTMLResponse, StreamingResponse
-from typing import Generator, Optional, Dict, List
+from fastapi.responses import HTMLResponse, Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from typing import Generator, Optional, Dict, List, Tuple, Union
+from functools import lru_cache
 import threading
 import logging
+from dataclasses import dataclass
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 import numpy as np
 import cv2
 import time
@@ -18,9 +22,12 @@ from pathlib import Path
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from src.config import settings
-from src.utils import RTSPClient
-from src.core import PersonDetector, ROIMatcher
+from src.config import (
+    settings,
+    RTSP_DEFAULT_TIMEOUT,
+)
+from src.utils import ChannelFrameCache, encode_jpeg, encode_jpeg_buffer, enable_nvjpeg
+from src.core import PersonDetector, ROIMatcher, BatchInferenceServer, load_roi_matcher
 
 
 # Logger
@@ -31,30 +38,130 @@ router = APIRouter(prefix="/debug", tags=["Debug Stream"])
 # Constants
 STREAM_JPEG_QUALITY = 80
 SNAPSHOT_JPEG_QUALITY = 90
+MAX_INFERENCE_BATCH = 8
+DETECTION_TIMEOUT = 2.0  # seconds a stream waits for its batched result
+DETECTION_SIZE = 640  # YOLO input size; longer frame side is resized to this
+MOTION_THUMB_SIZE = (64, 36)  # grayscale thumbnail used for motion gating
+MJPEG_PART_HEADER = b'--frame\r\nContent-Type: image/jpeg\r\n\r\n'
 
-# Global detector instance with thread-safe initialization
+if settings.USE_NVJPEG:
+    enable_nvjpeg()
+
+def _rtsp_url_for_channel(channel_id: int) -> str:
+    return settings.get_rtsp_url(
+        host=settings.RTSP_HOST,
+        port=settings.RTSP_PORT,
+        channel_id=channel_id
+    )
+
+
+# The one RTSP reader per channel, shared by the debug streams/snapshots
+# and the ROI API endpoints
+frame_cache = ChannelFrameCache(_rtsp_url_for_channel, hw_accel=settings.RTSP_HW_DECODE)
+
+
+# Shared YOLO detector, created once by get_detector()
 _detector: Optional[PersonDetector] = None
 _detector_lock = threading.Lock()
 
 
 def get_detector() -> PersonDetector:
-    """Get or create YOLO detector instance (thread-safe)."""
+    """Get or create YOLO detector instance (thread-safe).
+
+    Created once (eagerly at app startup when the debug router is enabled,
+    otherwise on first use); later calls return it without locking.
+    """
     global _detector
-    with _detector_lock:
-        if _detector is None:
-            logger.info("Initializing YOLO detector...")
-            _detector = PersonDetector(
-                model_path=settings.YOLO_MODEL,
-                confidence=settings.CONFIDENCE_THRESHOLD
-            )
-            logger.info("YOLO detector initialized")
+    if _detector is None:
+        with _detector_lock:
+            if _detector is None:
+                logger.info("Initializing YOLO detector...")
+                _detector = PersonDetector(
+                    model_path=settings.YOLO_MODEL,
+                    confidence=settings.CONFIDENCE_THRESHOLD
+                )
+                logger.info("YOLO detector initialized")
     return _detector
 
 
+def warm_up_detector() -> None:
+    """Load the detector at startup; failures are retried on first use."""
+    try:
+        get_detector()
+    except Exception as e:
+        logger.error(f"Failed to initialize YOLO detector at startup: {e}")
+
+
+# Shared batch inference server for all MJPEG streams
+_batch_server: Optional[BatchInferenceServer] = None
+_batch_server_lock = threading.Lock()
+
+
+def get_batch_server() -> BatchInferenceServer:
+    """Get or create the shared batch inference server (thread-safe)."""
+    global _batch_server
+    with _batch_server_lock:
+        if _batch_server is None:
+            max_batch = min(len(settings.ACTIVE_CHANNELS) or 1, MAX_INFERENCE_BATCH)
+            _batch_server = BatchInferenceServer(get_detector(), max_batch=max_batch)
+            _batch_server.start()
+    return _batch_server
+
+
 # 캐시된 ROI 데이터 (정규화 좌표)
 _roi_cache: Dict[int, List[Dict]] = {}
 _roi_cache_lock = threading.Lock()
 
+# 픽셀 좌표로 변환된 ROIMatcher 캐시 (channel_id, width, height) → matcher
+_roi_matcher_cache: Dict[Tuple[int, int, int], ROIMatcher] = {}
+
+
+def _valid_roi_seats(seats: List[Dict]) -> List[Dict]:
+    """Supabase 좌석 행 중 유효한 정규화 ROI만 골라 변환."""
+    valid_seats = []
+    for s in seats:
+        roi = s.get('roi_polygon')
+
+        # ROI가 없거나 점이 3개 미만이면 스킵
+        if not roi or not isinstance(roi, list) or len(roi) < 3:
+            continue
+
+        # 정규화 좌표 검증 (0.0 ~ 1.0 범위)
+        try:
+            is_normalized = all(
+                isinstance(point, (list, tuple)) and
+                len(point) >= 2 and
+                0 <= float(point[0]) <= 1 and
+                0 <= float(point[1]) <= 1
+                for point in roi
+            )
+        except (TypeError, ValueError):
+            logger.warning(f"좌석 {s['seat_id']}: 잘못된 좌표 형식, 스킵")
+            continue
+
+        if not is_normalized:
+            logger.warning(f"좌석 {s['seat_id']}: 비정규화 좌표 감지, 스킵")
+            continue
+
+        valid_seats.append({
+            'id': s['seat_id'],
+            'roi_normalized': roi,  # 정규화 좌표 보관
+            'label': s.get('seat_label') or f"{s['seat_id']}번"
+        })
+    return valid_seats
+
+
+def _store_roi_data(channel_id: int, seats: List[Dict]) -> List[Dict]:
+    valid_seats = _valid_roi_seats(seats)
+    with _roi_cache_lock:
+        _roi_cache[channel_id] = valid_seats
+
+    if valid_seats:
+        logger.info(f"채널 {channel_id}: {len(valid_seats)}개 ROI 로드 완료")
+    else:
+        logger.info(f"채널 {channel_id}: ROI 설정 없음 (YOLO만 표시)")
+    return valid_seats
+
 
 def _get_roi_data_from_supabase(channel_id: int) -> List[Dict]:
     """Supabase에서 ROI 데이터 조회 (캐싱됨).
@@ -75,52 +182,30 @@ def _get_roi_data_from_supabase(channel_id: int) -> List[Dict]:
 
         repo = get_seat_repository()
         seats = repo.get_seats_by_channel(settings.STORE_ID, channel_id)
+        return list(_store_roi_data(channel_id, seats))
 
-        # 유효한 좌석만 필터링 (정규화 좌표 검증)
-        valid_seats = []
-        for s in seats:
-            roi = s.get('roi_polygon')
-
-            # ROI가 없거나 점이 3개 미만이면 스킵
-            if not roi or not isinstance(roi, list) or len(roi) < 3:
-                continue
-
-            # 정규화 좌표 검증 (0.0 ~ 1.0 범위)
-            try:
-                is_normalized = all(
-                    isinstance(point, (list, tuple)) and
-                    len(point) >= 2 and
-                    0 <= float(point[0]) <= 1 and
-                    0 <= float(point[1]) <= 1
-                    for point in roi
-                )
-            except (TypeError, ValueError):
-                logger.warning(f"좌석 {s['seat_id']}: 잘못된 좌표 형식, 스킵")
-                continue
-
-            if not is_normalized:
-                logger.warning(f"좌석 {s['seat_id']}: 비정규화 좌표 감지, 스킵")
-                continue
-
-            valid_seats.append({
-                'id': s['seat_id'],
-                'roi_normalized': roi,  # 정규화 좌표 보관
-                'label': s.get('seat_label') or f"{s['seat_id']}번"
-            })
+    except Exception as e:
+        logger.error(f"ROI 데이터 로드 실패 (채널 {channel_id}): {e}")
+        return []
 
-        with _roi_cache_lock:
-            _roi_cache[channel_id] = valid_seats
 
-        if valid_seats:
-            logger.info(f"채널 {channel_id}: {len(valid_seats)}개 ROI 로드 완료")
-        else:
-            logger.info(f"채널 {channel_id}: ROI 설정 없음 (YOLO만 표시)")
+def prefetch_roi_data() -> None:
+    """Load ROIs of all active channels with one Supabase query at startup.
 
-        return valid_seats
+    Channels that fail here are loaded individually on first use.
+    """
+    channel_ids = list(getattr(settings, 'ACTIVE_CHANNELS', []))
+    if not channel_ids:
+        return
+    try:
+        from src.database.seat_repository import get_seat_repository
 
+        repo = get_seat_repository()
+        by_channel = repo.get_seats_by_channels(settings.STORE_ID, channel_ids)
+        for channel_id, seats in by_channel.items():
+            _store_roi_data(channel_id, seats)
     except Exception as e:
-        logger.error(f"ROI 데이터 로드 실패 (채널 {channel_id}): {e}")
-        return []
+        logger.error(f"ROI 데이터 일괄 로드 실패: {e}")
 
 
 def get_roi_matcher(channel_id: int, frame_width: int = 1920, frame_height: int = 1080) -> Optional[ROIMatcher]:
@@ -137,6 +222,12 @@ def get_roi_matcher(channel_id: int, frame_width: int = 1920, frame_height: int
     Returns:
         ROIMatcher 또는 None (ROI 없거나 에러 시)
     """
+    key = (channel_id, frame_width, frame_height)
+    with _roi_cache_lock:
+        cached = _roi_matcher_cache.get(key)
+    if cached is not None:
+        return cached
+
     try:
         roi_data = _get_roi_data_from_supabase(channel_id)
 
@@ -168,7 +259,10 @@ def get_roi_matcher(channel_id: int, frame_width: int = 1920, frame_height: int
             'seats': pixel_seats
         }
 
-        return ROIMatcher(config)
+        matcher = ROIMatcher(config)
+        with _roi_cache_lock:
+            _roi_matcher_cache[key] = matcher
+        return matcher
 
     except Exception as e:
         # 에러가 발생해도 YOLO 스트림은 계속 동작
@@ -185,9 +279,12 @@ def invalidate_roi_cache(channel_id: Optional[int] = None) -> None:
     with _roi_cache_lock:
         if channel_id is not None:
             _roi_cache.pop(channel_id, None)
+            for key in [k for k in _roi_matcher_cache if k[0] == channel_id]:
+                del _roi_matcher_cache[key]
             logger.debug(f"ROI cache invalidated: channel {channel_id}")
         else:
             _roi_cache.clear()
+            _roi_matcher_cache.clear()
             logger.debug("All ROI cache cleared")
 
 
@@ -198,9 +295,232 @@ def get_roi_matcher_from_file(channel_id: int) -> Optional[ROIMatcher]:
     Supabase 연동 전 테스트나 완전 오프라인 환경에서 사용.
     """
     config_path = settings.ROI_CONFIG_DIR / f"channel_{channel_id:02d}.json"
-    if config_path.exists():
-        return ROIMatcher(config_path)
-    return None
+    return load_roi_matcher(config_path)
+
+
+@dataclass
+class ChannelFrame:
+    """Frame published by a channel together with its detection results."""
+    frame: np.ndarray
+    detections: List
+    occupancy: Optional[Dict]
+    roi_matcher: Optional[ROIMatcher]
+    frame_id: int
+
+
+class ChannelPublisher:
+    """Single detector for a channel, shared by every viewer.
+
+    Frames come from the channel's reader in ``frame_cache``, which keeps
+    the one RTSP connection to the NVR and drains it continuously. A worker
+    thread takes only the newest frame, runs YOLO and ROI matching once, and
+    publishes a ``ChannelFrame``; frames that arrive meanwhile are dropped,
+    so latency stays low however slow detection is. Viewers sample the
+    published result at their own FPS, so neither the connection nor the
+    forward pass is duplicated per viewer. The worker stops when the last
+    viewer leaves.
+    """
+
+    def __init__(self, channel_id: int):
+        self.channel_id = channel_id
+
+        self._cond = threading.Condition()
+        # Latest detection result
+        self._result: Optional[ChannelFrame] = None
+        self._frame_id = 0
+        self._last_detections: List = []
+        self._subscribers = 0
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def connected(self) -> bool:
+        return frame_cache.is_connected(self.channel_id)
+
+    def subscribe(self) -> None:
+        """Register a viewer, starting the worker thread if needed."""
+        with self._cond:
+            self._subscribers += 1
+            if self._thread is None or not self._thread.is_alive():
+                self._stop_event.clear()
+                self._thread = threading.Thread(
+                    target=self._run, name=f"channel-{self.channel_id}", daemon=True
+                )
+                self._thread.start()
+
+    def unsubscribe(self) -> int:
+        """Unregister a viewer; stop the worker thread when none remain.
+
+        Returns:
+            Remaining subscriber count
+        """
+        with self._cond:
+            self._subscribers = max(0, self._subscribers - 1)
+            if self._subscribers == 0:
+                self._stop_event.set()
+                self._cond.notify_all()
+            return self._subscribers
+
+    def wait_for_result(self, last_frame_id: int, timeout: float) -> Optional[ChannelFrame]:
+        """Wait for a detection result newer than ``last_frame_id``.
+
+        Returns:
+            Published ChannelFrame, or None on timeout. The frame is shared
+            between viewers and must not be modified.
+        """
+        def is_new() -> bool:
+            return self._result is not None and self._result.frame_id != last_frame_id
+
+        with self._cond:
+            self._cond.wait_for(
+                lambda: is_new() or self._stop_event.is_set(), timeout=timeout
+            )
+            return self._result if is_new() else None
+
+    def _run(self) -> None:
+        """Worker loop: detect on the newest frame, publish.
+
+        Detection is pipelined one frame deep: frame N+1 is fetched, resized
+        and queued for inference before waiting on frame N's result, so the
+        decode/resize work overlaps the previous forward pass.
+        """
+        batch_server = get_batch_server()
+        pending: Optional[Tuple[np.ndarray, Optional[Future], float, Optional[ROIMatcher]]] = None
+        # Thumbnail of the last frame YOLO actually ran on (motion gating)
+        reference_thumb: Optional[np.ndarray] = None
+
+        # ROI matcher는 첫 프레임 해상도 확인 후 초기화
+        roi_matcher: Optional[ROIMatcher] = None
+        frame_shape = None
+        detection_scale = 1.0
+        frame_time = 0.0
+
+        logger.info(f"Starting detection for channel {self.channel_id}")
+        try:
+            while not self._stop_event.is_set():
+                # Newest frame only; anything grabbed meanwhile is dropped.
+                # The reader reconnects on its own if the stream drops.
+                frame, frame_time = frame_cache.wait_for_frame(
+                    self.channel_id, frame_time, timeout=RTSP_DEFAULT_TIMEOUT
+                )
+                if frame is None:
+                    if pending is not None:
+                        self._publish(*pending)
+                        pending = None
+                    continue
+
+                # 해상도 확인 후 ROI matcher 초기화 (재연결로 해상도가 바뀌면 다시)
+                if frame.shape[:2] != frame_shape:
+                    frame_shape = frame.shape[:2]
+                    frame_height, frame_width = frame_shape
+                    roi_matcher = get_roi_matcher(self.channel_id, frame_width, frame_height)
+                    detection_scale = min(1.0, DETECTION_SIZE / max(frame_height, frame_width))
+                    if roi_matcher:
+                        logger.info(f"ROI matcher initialized for channel {self.channel_id} ({frame_width}x{frame_height})")
+
+                # Static scene: reuse the previous detections instead of
+                # running YOLO again
+                thumb = cv2.resize(
+                    cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), MOTION_THUMB_SIZE,
+                    interpolation=cv2.INTER_AREA
+                )
+                if (
+                    reference_thumb is not None
+                    and cv2.absdiff(thumb, reference_thumb).mean() < settings.MOTION_THRESHOLD
+                ):
+                    future = None
+                else:
+                    reference_thumb = thumb
+
+                    # Detect on a downscaled copy; viewers draw on the native frame
+                    if detection_scale < 1.0:
+                        small = cv2.resize(
+                            frame, (0, 0), fx=detection_scale, fy=detection_scale,
+                            interpolation=cv2.INTER_AREA
+                        )
+                    else:
+                        small = frame
+
+                    # Queue this frame (batched with the other active channels)
+                    future = batch_server.submit(self.channel_id, small)
+
+                # Finish the previous frame while this one runs
+                if pending is not None:
+                    self._publish(*pending)
+                pending = (frame, future, detection_scale, roi_matcher)
+        finally:
+            if pending is not None and pending[1] is not None:
+                pending[1].cancel()
+            logger.info(f"Stopped detection for channel {self.channel_id}")
+
+    def _publish(
+        self,
+        frame: np.ndarray,
+        future: Optional[Future],
+        detection_scale: float,
+        roi_matcher: Optional[ROIMatcher]
+    ) -> None:
+        """Wait for a queued detection, match ROIs and publish the result.
+
+        ``future`` is None for frames skipped by motion gating; they reuse
+        the last detections.
+        """
+        try:
+            if future is None:
+                detections = self._last_detections
+            else:
+                try:
+                    detections = future.result(timeout=DETECTION_TIMEOUT)
+                    if detection_scale < 1.0:
+                        detections = scale_detections(detections, 1.0 / detection_scale)
+                    self._last_detections = detections
+                except FutureTimeoutError:
+                    # Don't let the batch server spend GPU time on a stale frame
+                    future.cancel()
+                    logger.warning(f"Detection timed out on channel {self.channel_id}, reusing last result")
+                    detections = self._last_detections
+
+            occupancy = None
+            if roi_matcher:
+                occupancy = roi_matcher.check_occupancy(detections, iou_threshold=settings.IOU_THRESHOLD)
+        except Exception as e:
+            logger.error(f"Detection error on channel {self.channel_id}: {e}", exc_info=True)
+            detections, occupancy = self._last_detections, None
+
+        with self._cond:
+            self._frame_id += 1
+            self._result = ChannelFrame(
+                frame=frame,
+                detections=detections,
+                occupancy=occupancy,
+                roi_matcher=roi_matcher,
+                frame_id=self._frame_id
+            )
+            self._cond.notify_all()
+
+
+# One publisher per channel, shared by all viewers
+_channel_streams: Dict[int, ChannelPublisher] = {}
+_channel_streams_lock = threading.Lock()
+
+
+def acquire_publisher(channel_id: int) -> ChannelPublisher:
+    """Get (or create) the channel's publisher and subscribe to it."""
+    with _channel_streams_lock:
+        publisher = _channel_streams.get(channel_id)
+        if publisher is None:
+            publisher = ChannelPublisher(channel_id)
+            _channel_streams[channel_id] = publisher
+        publisher.subscribe()
+    return publisher
+
+
+def release_publisher(channel_id: int) -> None:
+    """Unsubscribe from the channel's publisher, dropping it when unused."""
+    with _channel_streams_lock:
+        publisher = _channel_streams.get(channel_id)
+        if publisher is not None and publisher.unsubscribe() == 0:
+            del _channel_streams[channel_id]
 
 
 def generate_mjpeg_stream(channel_id: int, fps: int = 5) -> Generator[bytes, None, None]:
@@ -213,98 +533,57 @@ def generate_mjpeg_stream(channel_id: int, fps: int = 5) -> Generator[bytes, Non
     Yields:
         MJPEG frame bytes
     """
-    # Build RTSP URL using settings method (secure)
-    rtsp_url = settings.get_rtsp_url(
-        host=settings.RTSP_HOST,
-        port=settings.RTSP_PORT,
-        channel_id=channel_id
-    )
-
-    client = RTSPClient(rtsp_url)
     detector = get_detector()
 
-    # ROI matcher는 첫 프레임 캡처 후 해상도 확인 후 초기화
-    roi_matcher: Optional[ROIMatcher] = None
-    roi_initialized = False
-
     frame_interval = 1.0 / fps
     error_count = 0
     max_errors = 10
+    last_frame_id = 0
+    # Reused per-viewer frame buffer for drawing overlays
+    scratch: Optional[np.ndarray] = None
 
     logger.info(f"Starting MJPEG stream for channel {channel_id} at {fps} FPS")
+    publisher = acquire_publisher(channel_id)
 
     try:
-        if not client.connect(timeout=10):
-            logger.error(f"Failed to connect to channel {channel_id}")
-            error_frame = create_error_frame(f"Failed to connect to channel {channel_id}")
-            _, buffer = cv2.imencode('.jpg', error_frame)
-            yield (b'--frame\r\n'
-                   b'Content-Type: image/jpeg\r\n\r\n' + buffer.tobytes() + b'\r\n')
-            return
-
         while True:
             start_time = time.time()
 
             try:
-                # Capture frame
-                frame = client.capture_frame()
-                if frame is None:
+                # Latest frame + detections from the shared channel publisher
+                result = publisher.wait_for_result(
+                    last_frame_id, timeout=RTSP_DEFAULT_TIMEOUT
+                )
+                if result is None:
                     error_count += 1
                     if error_count >= max_errors:
                         logger.error(f"Max errors reached on channel {channel_id}, stopping stream")
                         break
 
-                    # Try to reconnect
-                    client.disconnect()
-                    if not client.connect(timeout=10):
-                        error_frame = create_error_frame("Connection lost, reconnecting...")
-                        _, buffer = cv2.imencode('.jpg', error_frame)
-                        yield (b'--frame\r\n'
-                               b'Content-Type: image/jpeg\r\n\r\n' + buffer.tobytes() + b'\r\n')
-                        time.sleep(1)
-                        continue
-                    # Reset error count on successful reconnection
-                    error_count = 0
-                    roi_initialized = False  # 재연결 시 ROI 다시 초기화
-                    logger.info(f"Reconnected to channel {channel_id}")
+                    if publisher.connected:
+                        message = "Connection lost, reconnecting..."
+                    else:
+                        message = f"Failed to connect to channel {channel_id}"
+                    error_frame = create_error_frame(message)
+                    yield mjpeg_part(encode_jpeg_buffer(error_frame))
                     continue
 
                 # Reset error count on successful frame
                 error_count = 0
+                last_frame_id = result.frame_id
+
+                # Draw boxes, ROIs and debug info in a single pass on this
+                # viewer's own scratch buffer (the published frame is shared)
+                if scratch is None or scratch.shape != result.frame.shape:
+                    scratch = np.empty_like(result.frame)
+                np.copyto(scratch, result.frame)
+                annotated = render_overlay(
+                    scratch, detector, result.detections, channel_id,
+                    result.roi_matcher, result.occupancy
+                )
 
-                # 첫 프레임에서 해상도 확인 후 ROI matcher 초기화
-                if not roi_initialized:
-                    frame_height, frame_width = frame.shape[:2]
-                    roi_matcher = get_roi_matcher(channel_id, frame_width, frame_height)
-                    roi_initialized = True
-                    if roi_matcher:
-                        logger.info(f"ROI matcher initialized for channel {channel_id} ({frame_width}x{frame_height})")
-
-                # Detect persons
-                detections = detector.detect_persons(frame)
-
-                # Annotate frame with bounding boxes
-                annotated = detector.annotate_image(frame, detections)
-
-                # Add ROI overlay if config exists
-                if roi_matcher:
-                    occupancy = roi_matcher.check_occupancy(detections, iou_threshold=settings.IOU_THRESHOLD)
-                    annotated = roi_matcher.visualize_rois(annotated, occupancy)
-
-                    # Draw person bottom center points
-                    for x1, y1, x2, y2, conf in detections:
-                        bottom_center = (int((x1 + x2) / 2), int(y2))
-                        cv2.circle(annotated, bottom_center, 8, (255, 0, 255), -1)
-
-                # Add debug info overlay
-                annotated = add_debug_overlay(annotated, channel_id, len(detections), fps)
-
-                # Encode to JPEG
-                _, buffer = cv2.imencode('.jpg', annotated, [cv2.IMWRITE_JPEG_QUALITY, STREAM_JPEG_QUALITY])
-
-                # Yield MJPEG frame
-                yield (b'--frame\r\n'
-                       b'Content-Type: image/jpeg\r\n\r\n' + buffer.tobytes() + b'\r\n')
+                # Encode to JPEG and yield MJPEG frame
+                yield mjpeg_part(encode_jpeg_buffer(annotated, STREAM_JPEG_QUALITY))
 
             except cv2.error as e:
                 logger.error(f"OpenCV error on channel {channel_id}: {e}")
@@ -325,14 +604,30 @@ def generate_mjpeg_stream(channel_id: int, fps: int = 5) -> Generator[bytes, Non
         # Yield error frame before exiting
         try:
             error_frame = create_error_frame(f"Error: {str(e)[:30]}")
-            _, buffer = cv2.imencode('.jpg', error_frame)
-            yield (b'--frame\r\n'
-                   b'Content-Type: image/jpeg\r\n\r\n' + buffer.tobytes() + b'\r\n')
+            yield mjpeg_part(encode_jpeg_buffer(error_frame))
         except Exception as encode_error:
             logger.error(f"Failed to create error frame for channel {channel_id}: {encode_error}")
     finally:
-        client.disconnect()
-        logger.info(f"Disconnected from channel {channel_id}")
+        release_publisher(channel_id)
+
+
+def mjpeg_part(jpeg_bytes: Union[bytes, memoryview]) -> bytes:
+    """Wrap JPEG bytes as one multipart/x-mixed-replace part.
+
+    The encoded buffer is copied exactly once, into the joined chunk. The
+    part is deliberately yielded as one chunk: StreamingResponse iterates
+    sync generators through the threadpool, so separate header/body/trailer
+    yields would cost three thread hops per frame to save one memcpy.
+    """
+    return b''.join((MJPEG_PART_HEADER, jpeg_bytes, b'\r\n'))
+
+
+def scale_detections(detections: List, factor: float) -> List:
+    """Scale (x1, y1, x2, y2, confidence) boxes by ``factor``."""
+    return [
+        (int(x1 * factor), int(y1 * factor), int(x2 * factor), int(y2 * factor), conf)
+        for x1, y1, x2, y2, conf in detections
+    ]
 
 
 def create_error_frame(message: str, width: int = 640, height: int = 480) -> np.ndarray:
@@ -355,27 +650,131 @@ def create_error_frame(message: str, width: int = 640, height: int = 480) -> np.
     return frame
 
 
-def add_debug_overlay(frame: np.ndarray, channel_id: int, person_count: int, fps: int) -> np.ndarray:
-    """Add debug information overlay to frame."""
-    # Add semi-transparent background for text
-    overlay = frame.copy()
-    cv2.rectangle(overlay, (10, 10), (350, 90), (0, 0, 0), -1)
-    frame = cv2.addWeighted(overlay, 0.5, frame, 0.5, 0)
+# Pixel offsets of a filled disk (radius 8) used to mark bottom centers
+_MARKER_RADIUS = 8
+_marker_dy, _marker_dx = np.nonzero(
+    np.hypot(*np.ogrid[-_MARKER_RADIUS:_MARKER_RADIUS + 1, -_MARKER_RADIUS:_MARKER_RADIUS + 1])
+    <= _MARKER_RADIUS
+)
+_MARKER_DY = (_marker_dy - _MARKER_RADIUS).astype(np.int32)
+_MARKER_DX = (_marker_dx - _MARKER_RADIUS).astype(np.int32)
 
-    font = cv2.FONT_HERSHEY_SIMPLEX
-    font_scale = 0.6
-    thickness = 2
-    color = (0, 255, 0)  # Green
 
-    # Channel info
-    cv2.putText(frame, f"Channel: {channel_id}", (20, 35), font, font_scale, color, thickness)
+def draw_bottom_centers(
+    frame: np.ndarray,
+    detections: List,
+    color: tuple = (255, 0, 255)
+) -> None:
+    """Mark each person's bottom-center point with a filled disk, in place.
+
+    All markers are splatted with a single fancy-indexed assignment
+    instead of one cv2.circle call per detection.
+    """
+    if not detections:
+        return
+
+    boxes = np.asarray(detections, dtype=np.float32)[:, :4]
+    cx = ((boxes[:, 0] + boxes[:, 2]) * 0.5).astype(np.int32)
+    cy = boxes[:, 3].astype(np.int32)
+
+    ys = (cy[:, None] + _MARKER_DY[None, :]).ravel()
+    xs = (cx[:, None] + _MARKER_DX[None, :]).ravel()
+
+    height, width = frame.shape[:2]
+    inside = (ys >= 0) & (ys < height) & (xs >= 0) & (xs < width)
+    frame[ys[inside], xs[inside]] = color
+
 
-    # Detection count
-    cv2.putText(frame, f"Persons: {person_count}", (20, 60), font, font_scale, color, thickness)
+# Debug info box (frame coordinates) and text style
+_OVERLAY_X0, _OVERLAY_Y0, _OVERLAY_X1, _OVERLAY_Y1 = 10, 10, 351, 91
+_OVERLAY_FONT = cv2.FONT_HERSHEY_SIMPLEX
+_OVERLAY_FONT_SCALE = 0.6
+_OVERLAY_THICKNESS = 2
 
-    # Timestamp
-    timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-    cv2.putText(frame, timestamp, (20, 85), font, font_scale, (255, 255, 255), thickness)
+
+_OVERLAY_PAD = _OVERLAY_THICKNESS + 1  # stroke bleed around the text box
+_OVERLAY_GREEN = (0, 255, 0)
+_OVERLAY_WHITE = (255, 255, 255)
+
+
+@lru_cache(maxsize=128)
+def _get_text_stamp(text: str, color: Tuple[int, int, int]) -> Tuple[np.ndarray, np.ndarray, int]:
+    """Rasterize a debug overlay string once.
+
+    The text is drawn on black; its intensity doubles as coverage (fonts
+    may be anti-aliased), so stamping is ``region * (1 - a) + text``.
+    Channel labels and person counts repeat constantly and the timestamp
+    changes once per second, so putText runs about once per second in
+    total instead of three times per frame per stream.
+
+    Returns:
+        (text pixels, 255 - coverage, top of the stamp relative to baseline)
+    """
+    (width, ascent), descent = cv2.getTextSize(
+        text, _OVERLAY_FONT, _OVERLAY_FONT_SCALE, _OVERLAY_THICKNESS
+    )
+    pad = _OVERLAY_PAD
+    pixels = np.zeros((ascent + descent + 2 * pad, width + 2 * pad, 3), dtype=np.uint8)
+    cv2.putText(
+        pixels, text, (pad, pad + ascent),
+        _OVERLAY_FONT, _OVERLAY_FONT_SCALE, color, _OVERLAY_THICKNESS
+    )
+    coverage = pixels.max(axis=2, keepdims=True)
+    inv_coverage = np.repeat(255 - coverage, 3, axis=2)
+    pixels.flags.writeable = False
+    inv_coverage.flags.writeable = False
+    return pixels, inv_coverage, -(pad + ascent)
+
+
+def _stamp_text(
+    frame: np.ndarray,
+    text: str,
+    origin: Tuple[int, int],
+    color: Tuple[int, int, int]
+) -> None:
+    """Draw ``text`` at ``origin`` (like cv2.putText) from the stamp cache."""
+    pixels, inv_coverage, top = _get_text_stamp(text, color)
+    x0, y0 = origin[0] - _OVERLAY_PAD, origin[1] + top
+    y1, x1 = y0 + pixels.shape[0], x0 + pixels.shape[1]
+    if x0 < 0 or y0 < 0 or y1 > frame.shape[0] or x1 > frame.shape[1]:
+        cv2.putText(frame, text, origin, _OVERLAY_FONT,
+                    _OVERLAY_FONT_SCALE, color, _OVERLAY_THICKNESS)
+        return
+
+    region = frame[y0:y1, x0:x1]
+    cv2.multiply(region, inv_coverage, dst=region, scale=1 / 255.0)
+    cv2.add(region, pixels, dst=region)
+
+
+def render_overlay(
+    frame: np.ndarray,
+    detector: PersonDetector,
+    detections: List,
+    channel_id: int,
+    roi_matcher: Optional[ROIMatcher] = None,
+    occupancy: Optional[Dict] = None
+) -> np.ndarray:
+    """Draw detections, ROIs and debug info directly into ``frame``.
+
+    The captured frame is owned by the caller and not reused, so every
+    layer is drawn in place instead of copying the full image per layer.
+    """
+    detector.annotate_image(frame, detections, inplace=True)
+
+    if roi_matcher:
+        roi_matcher.visualize_rois(frame, occupancy, inplace=True)
+
+        # Draw person bottom center points
+        draw_bottom_centers(frame, detections)
+
+    # Semi-transparent background for text: halve the box region only
+    region = frame[_OVERLAY_Y0:_OVERLAY_Y1, _OVERLAY_X0:_OVERLAY_X1]
+    np.right_shift(region, 1, out=region)
+
+    # Channel info, detection count and timestamp from pre-rendered stamps
+    _stamp_text(frame, f"Channel: {channel_id}", (20, 35), _OVERLAY_GREEN)
+    _stamp_text(frame, f"Persons: {len(detections)}", (20, 60), _OVERLAY_GREEN)
+    _stamp_text(frame, time.strftime("%Y-%m-%d %H:%M:%S"), (20, 85), _OVERLAY_WHITE)
 
     return frame
 
@@ -384,18 +783,8 @@ def add_debug_overlay(frame: np.ndarray, channel_id: int, person_count: int, fps
 # API Endpoints
 # ============================================================================
 
-@router.get("/", response_class=HTMLResponse)
-async def debug_index():
-    """Debug stream index page with channel selection."""
-    active_channels = getattr(settings, 'ACTIVE_CHANNELS', [1, 2, 3, 4])
-
-    channel_links = "\n".join([
-        f'<a href="/debug/stream/{ch}" target="_blank" class="channel-link">'
-        f'Channel {ch}</a>'
-        for ch in active_channels
-    ])
-
-    html = f"""
+# Index page skeleton; only store, channel list, links and grid vary
+_INDEX_TEMPLATE = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -457,26 +846,52 @@ async def debug_index():
     <body>
         <h1>CCTV Debug Stream</h1>
         <div class="info">
-            <p><strong>Store:</strong> {settings.STORE_ID}</p>
-            <p><strong>Active Channels:</strong> {', '.join(map(str, active_channels))}</p>
+            <p><strong>Store:</strong> {store_id}</p>
+            <p><strong>Active Channels:</strong> {active}</p>
             <p><strong>Debug Mode:</strong> YOLO bounding boxes + ROI overlay</p>
         </div>
 
         <h2>Select Channel (opens in new tab)</h2>
         <div class="channels">
-            {channel_links}
+            {links}
         </div>
 
         <div class="grid-view">
             <h2>All Channels Grid View</h2>
             <div class="stream-grid">
-                {''.join([f'<img src="/debug/stream/{ch}" alt="Channel {ch}">' for ch in active_channels[:4]])}
+                {grid}
             </div>
         </div>
     </body>
     </html>
     """
-    return HTMLResponse(content=html)
+
+
+@lru_cache(maxsize=1)
+def _render_index(store_id: str, active_channels: tuple) -> str:
+    """Render the debug index page (cached per store/channel set)."""
+    links = "\n".join([
+        f'<a href="/debug/stream/{ch}" target="_blank" class="channel-link">'
+        f'Channel {ch}</a>'
+        for ch in active_channels
+    ])
+    grid = ''.join([
+        f'<img src="/debug/stream/{ch}" alt="Channel {ch}">'
+        for ch in active_channels[:4]
+    ])
+    return _INDEX_TEMPLATE.format(
+        store_id=store_id,
+        active=', '.join(map(str, active_channels)),
+        links=links,
+        grid=grid
+    )
+
+
+@router.get("/", response_class=HTMLResponse)
+async def debug_index():
+    """Debug stream index page with channel selection."""
+    active_channels = getattr(settings, 'ACTIVE_CHANNELS', [1, 2, 3, 4])
+    return HTMLResponse(content=_render_index(settings.STORE_ID, tuple(active_channels)))
 
 
 @router.get("/stream/{channel_id}")
@@ -508,51 +923,37 @@ async def snapshot_channel(channel_id: int):
     if not 1 <= channel_id <= 16:
         raise HTTPException(status_code=400, detail="Channel ID must be between 1 and 16")
 
-    # Build RTSP URL using settings method (secure)
-    rtsp_url = settings.get_rtsp_url(
-        host=settings.RTSP_HOST,
-        port=settings.RTSP_PORT,
-        channel_id=channel_id
+    # RTSP/YOLO work blocks, so keep it off the event loop
+    jpeg_bytes = await run_in_threadpool(_capture_annotated_snapshot, channel_id)
+    return Response(
+        content=jpeg_bytes,
+        media_type="image/jpeg",
+        headers={"Cache-Control": "no-store"}
     )
 
-    client = RTSPClient(rtsp_url)
-    detector = get_detector()
-
-    try:
-        if not client.connect(timeout=10):
-            raise HTTPException(status_code=503, detail=f"Failed to connect to channel {channel_id}")
-
-        frame = client.capture_frame()
-        if frame is None:
-            raise HTTPException(status_code=500, detail="Failed to capture frame")
 
-        # 프레임 해상도 확인 후 ROI matcher 초기화
-        frame_height, frame_width = frame.shape[:2]
-        roi_matcher = get_roi_matcher(channel_id, frame_width, frame_height)
-
-        # Detect and annotate
-        detections = detector.detect_persons(frame)
-        annotated = detector.annotate_image(frame, detections)
-
-        if roi_matcher:
-            occupancy = roi_matcher.check_occupancy(detections, iou_threshold=settings.IOU_THRESHOLD)
-            annotated = roi_matcher.visualize_rois(annotated, occupancy)
+def _capture_annotated_snapshot(channel_id: int) -> bytes:
+    """Capture one frame, detect, draw the overlay and encode (blocking)."""
+    detector = get_detector()
 
-            for x1, y1, x2, y2, conf in detections:
-                bottom_center = (int((x1 + x2) / 2), int(y2))
-                cv2.circle(annotated, bottom_center, 8, (255, 0, 255), -1)
+    # Private copy: render_overlay() draws in place
+    frame = frame_cache.get_latest(channel_id, max_age_s=1.0, timeout=10)
+    if frame is None:
+        raise HTTPException(status_code=503, detail=f"No frame available for channel {channel_id}")
 
-        annotated = add_debug_overlay(annotated, channel_id, len(detections), 0)
+    # 프레임 해상도 확인 후 ROI matcher 초기화
+    frame_height, frame_width = frame.shape[:2]
+    roi_matcher = get_roi_matcher(channel_id, frame_width, frame_height)
 
-        _, buffer = cv2.imencode('.jpg', annotated, [cv2.IMWRITE_JPEG_QUALITY, SNAPSHOT_JPEG_QUALITY])
+    # Detect and annotate
+    detections = detector.detect_persons(frame)
 
-        return StreamingResponse(
-            iter([buffer.tobytes()]),
-            media_type="image/jpeg"
-        )
+    occupancy = None
+    if roi_matcher:
+        occupancy = roi_matcher.check_occupancy(detections, iou_threshold=settings.IOU_THRESHOLD)
+    annotated = render_overlay(frame, detector, detections, channel_id, roi_matcher, occupancy)
 
-    finally:
-        client.disconnect()
+    return encode_jpeg(annotated, SNAPSHOT_JPEG_QUALITY)
 
 
 @router.get("/status")
@@ -1,25 +1,48 @@
 """FastAPI endpoints for ROI configuration management."""
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.responses import FileResponse, Response
+from starlette.concurrency import run_in_threadpool
+import anyio
+import anyio.to_thread
 from pydantic import BaseModel
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Set, Tuple
 from pathlib import Path
-import json
+import asyncio
+import re
 import sys
+import threading
+import time
 import os
 import cv2
-import io
+import logging
+import platform
+import numpy as np
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from src.config import settings
-from src.utils import RTSPClient
-from src.core import PersonDetector, ROIMatcher
-from src.api.debug_stream import router as debug_router
+from src.utils import (
+    check_opencv_jpeg_build,
+    configure_opencv,
+    encode_jpeg,
+    get_jpeg_backend,
+    write_bytes_atomic,
+)
+from src.core import ROIMatcher, load_roi_matcher
+from src.auto_detect_seats import close_seat_edges
+from src.api.debug_stream import (
+    router as debug_router,
+    get_batch_server,
+    get_detector,
+    frame_cache,
+    prefetch_roi_data,
+    warm_up_detector,
+)
 
+logger = logging.getLogger(__name__)
 
 app = FastAPI(title="CCTV ROI Configuration API")
 
@@ -44,9 +67,38 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Live camera images must not be served from browser/proxy caches
+NO_STORE_HEADERS = {"Cache-Control": "no-store"}
+
+# Worker threads for blocking RTSP/OpenCV calls (16 channels x 2 concurrent)
+THREADPOOL_SIZE = 64
+
+# Requests already run in parallel on the threadpool; don't let every
+# OpenCV call fan out its own worker threads on top of that
+configure_opencv(1)
+
+
+@app.on_event("startup")
+async def configure_threadpool():
+    """Raise the default AnyIO threadpool limit (40) for concurrent captures."""
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+
+
+@app.on_event("startup")
+async def check_jpeg_encoder():
+    """Log the JPEG encoder in use and warn about slow OpenCV builds."""
+    logger.info("JPEG encoder: %s (%s)", get_jpeg_backend(), platform.machine())
+    check_opencv_jpeg_build()
+
+
 # Include debug stream router if enabled
 if os.getenv("DEBUG_STREAM_ENABLED", "false").lower() == "true":
     app.include_router(debug_router)
+    # Load YOLO before the first stream; without the debug router it is
+    # only loaded if the detect endpoint is used
+    app.on_event("startup")(warm_up_detector)
+    # All active channels' ROIs in one query instead of one per stream
+    app.on_event("startup")(prefetch_roi_data)
 
 # Mount static files for frontend
 static_dir = Path(__file__).parent / "static"
@@ -80,8 +132,7 @@ class ChannelInfo(BaseModel):
 
 
 # Helper functions
-def get_rtsp_url_for_channel(channel_id: int) -> str:
-    """Get RTSP URL for specific channel (1-16) using settings method."""
+def _build_rtsp_url(channel_id: int) -> str:
     return settings.get_rtsp_url(
         host=settings.RTSP_HOST,
         port=settings.RTSP_PORT,
@@ -89,9 +140,65 @@ def get_rtsp_url_for_channel(channel_id: int) -> str:
     )
 
 
+def _build_config_path(channel_id: int) -> Path:
+    return settings.ROI_CONFIG_DIR / f"channel_{channel_id:02d}.json"
+
+
+# Settings are fixed for the process lifetime; prebuild per-channel values
+_RTSP_URLS = {i: _build_rtsp_url(i) for i in range(1, 17)}
+_CONFIG_PATHS = {i: _build_config_path(i) for i in range(1, 17)}
+
+
+# Channels with a config file, refreshed from one directory scan per second
+_CONFIG_INDEX_TTL = 1.0
+_CONFIG_FILE_RE = re.compile(r"channel_(\d{2})\.json")
+_config_index = {"t": 0.0, "channels": set()}
+
+
+def _existing_channels() -> Set[int]:
+    """Channel ids that have a config file (cached directory scan)."""
+    now = time.monotonic()
+    if now - _config_index["t"] > _CONFIG_INDEX_TTL:
+        channels = set()
+        try:
+            with os.scandir(settings.ROI_CONFIG_DIR) as entries:
+                for entry in entries:
+                    match = _CONFIG_FILE_RE.fullmatch(entry.name)
+                    if match:
+                        channels.add(int(match.group(1)))
+        except FileNotFoundError:
+            pass
+        _config_index["channels"] = channels
+        _config_index["t"] = now
+    return _config_index["channels"]
+
+
+def _invalidate_config_index() -> None:
+    _config_index["t"] = 0.0
+
+
+def get_rtsp_url_for_channel(channel_id: int) -> str:
+    """Get RTSP URL for specific channel (1-16) using settings method."""
+    url = _RTSP_URLS.get(channel_id)
+    return url if url is not None else _build_rtsp_url(channel_id)
+
+
 def get_config_path_for_channel(channel_id: int) -> Path:
     """Get ROI config file path for specific channel."""
-    return settings.ROI_CONFIG_DIR / f"channel_{channel_id:02d}.json"
+    path = _CONFIG_PATHS.get(channel_id)
+    return path if path is not None else _build_config_path(channel_id)
+
+
+@app.on_event("startup")
+async def start_frame_cache():
+    """Open RTSP readers for active channels before the first request."""
+    frame_cache.start(settings.ACTIVE_CHANNELS)
+
+
+@app.on_event("shutdown")
+async def stop_frame_cache():
+    """Close all RTSP reader connections."""
+    await run_in_threadpool(frame_cache.stop)
 
 
 # API Endpoints
@@ -109,13 +216,13 @@ async def list_channels():
     """List active RTSP channels with their config status."""
     channels = []
     active_channels = settings.ACTIVE_CHANNELS
+    existing = _existing_channels()
 
     for i in active_channels:
-        config_path = get_config_path_for_channel(i)
         channels.append(ChannelInfo(
             channel_id=i,
             rtsp_path=f"live_{i:02d}",  # Format as 01, 02, 03, etc.
-            config_exists=config_path.exists()
+            config_exists=i in existing
         ))
     return channels
 
@@ -132,32 +239,27 @@ async def get_channel_snapshot(channel_id: int, width: int = 1920, height: int =
     if not 1 <= channel_id <= 16:
         raise HTTPException(status_code=400, detail="Channel ID must be between 1 and 16")
 
-    rtsp_url = get_rtsp_url_for_channel(channel_id)
-    client = RTSPClient(rtsp_url)
-
-    try:
-        if not client.connect(timeout=10):
-            raise HTTPException(status_code=503, detail=f"Failed to connect to channel {channel_id}")
-
-        frame = client.capture_frame()
-
-        if frame is None:
-            raise HTTPException(status_code=500, detail="Failed to capture frame")
+    # RTSP/OpenCV work blocks, so keep it off the event loop
+    jpeg_bytes = await run_in_threadpool(_capture_snapshot, channel_id, width, height)
+    return Response(content=jpeg_bytes, media_type="image/jpeg", headers=NO_STORE_HEADERS)
 
-        # Resize if needed
-        if frame.shape[1] != width or frame.shape[0] != height:
-            frame = cv2.resize(frame, (width, height))
 
-        # Convert to JPEG
-        success, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
+def _capture_snapshot(channel_id: int, width: int, height: int) -> bytes:
+    """Capture, resize and JPEG-encode one frame (blocking)."""
+    # Only read: cv2.resize and the encoder write to new buffers
+    frame = frame_cache.get_latest(channel_id, max_age_s=1.0, timeout=10, copy=False)
+    if frame is None:
+        raise HTTPException(status_code=503, detail=f"No frame available for channel {channel_id}")
 
-        if not success:
-            raise HTTPException(status_code=500, detail="Failed to encode image")
+    # Resize if needed
+    if frame.shape[1] != width or frame.shape[0] != height:
+        frame = cv2.resize(frame, (width, height))
 
-        return StreamingResponse(io.BytesIO(buffer.tobytes()), media_type="image/jpeg")
-
-    finally:
-        client.disconnect()
+    # Convert to JPEG (libjpeg-turbo when available)
+    try:
+        return encode_jpeg(frame, quality=85)
+    except ValueError:
+        raise HTTPException(status_code=500, detail="Failed to encode image")
 
 
 @app.get("/api/channels/{channel_id}/config", response_model=ROIConfig)
@@ -170,9 +272,10 @@ async def get_channel_config(channel_id: int):
     if not 1 <= channel_id <= 16:
         raise HTTPException(status_code=400, detail="Channel ID must be between 1 and 16")
 
-    config_path = get_config_path_for_channel(channel_id)
+    # File I/O runs in worker threads so disk stalls don't block the loop
+    config_path = anyio.Path(get_config_path_for_channel(channel_id))
 
-    if not config_path.exists():
+    if not await config_path.exists():
         # Return empty config
         return ROIConfig(
             camera_id=f"branch01_cam{channel_id}",
@@ -181,9 +284,7 @@ async def get_channel_config(channel_id: int):
         )
 
     try:
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
-        return ROIConfig(**config)
+        return ROIConfig.model_validate_json(await config_path.read_bytes())
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to load config: {str(e)}")
 
@@ -199,15 +300,16 @@ async def save_channel_config(channel_id: int, config: ROIConfig):
     if not 1 <= channel_id <= 16:
         raise HTTPException(status_code=400, detail="Channel ID must be between 1 and 16")
 
-    config_path = get_config_path_for_channel(channel_id)
+    config_path = anyio.Path(get_config_path_for_channel(channel_id))
 
     try:
         # Ensure directory exists
-        config_path.parent.mkdir(parents=True, exist_ok=True)
+        await config_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Save config
-        with open(config_path, 'w', encoding='utf-8') as f:
-            json.dump(config.model_dump(), f, ensure_ascii=False, indent=2)
+        # Save config (pydantic-core JSON, same layout as json.dump(indent=2))
+        data = config.model_dump_json(indent=2).encode('utf-8')
+        await run_in_threadpool(write_bytes_atomic, Path(config_path), data)
+        _invalidate_config_index()
 
         return {"message": f"Config saved for channel {channel_id}", "path": str(config_path)}
     except Exception as e:
@@ -215,73 +317,122 @@ async def save_channel_config(channel_id: int, config: ROIConfig):
 
 
 @app.post("/api/channels/{channel_id}/auto-detect")
-async def auto_detect_seats(channel_id: int, min_area: int = 10000, max_area: int = 150000):
+async def auto_detect_seats(
+    channel_id: int,
+    min_area: int = 10000,
+    max_area: int = 150000,
+    scale: float = Query(0.5, gt=0, le=1)
+):
     """Auto-detect seat regions from camera image.
 
     Args:
         channel_id: Channel number (1-16)
-        min_area: Minimum contour area
-        max_area: Maximum contour area
+        min_area: Minimum contour area (original pixels)
+        max_area: Maximum contour area (original pixels)
+        scale: Downscale factor for the detection pipeline (1.0 = full size)
     """
     if not 1 <= channel_id <= 16:
         raise HTTPException(status_code=400, detail="Channel ID must be between 1 and 16")
 
-    rtsp_url = get_rtsp_url_for_channel(channel_id)
-    client = RTSPClient(rtsp_url)
-
-    try:
-        if not client.connect(timeout=10):
-            raise HTTPException(status_code=503, detail=f"Failed to connect to channel {channel_id}")
-
-        frame = client.capture_frame()
+    return await run_in_threadpool(_auto_detect_seats, channel_id, min_area, max_area, scale)
 
-        if frame is None:
-            raise HTTPException(status_code=500, detail="Failed to capture frame")
 
-        # Auto-detect seats
-        import numpy as np
-
-        # Convert to grayscale
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+def _has_cuda_opencv() -> bool:
+    """Check for a CUDA-enabled OpenCV build with a usable device."""
+    try:
+        return cv2.cuda.getCudaEnabledDeviceCount() > 0
+    except (AttributeError, cv2.error):
+        return False
 
-        # Apply Gaussian blur
-        blurred = cv2.GaussianBlur(gray, (5, 5), 0)
 
-        # Edge detection
-        edges = cv2.Canny(blurred, 50, 150)
+_CUDA_EDGES = _has_cuda_opencv()
+# CUDA filter objects aren't thread-safe; auto-detect requests are rare
+_cuda_edges_lock = threading.Lock()
+_cuda_edge_filters: Dict[str, object] = {}
 
-        # Morphological operations
-        kernel = np.ones((5, 5), np.uint8)
-        closed = cv2.morphologyEx(edges, cv2.MORPH_CLOSE, kernel, iterations=2)
 
-        # Find contours
-        contours, _ = cv2.findContours(closed, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+def _seat_edges_cuda(frame: np.ndarray) -> np.ndarray:
+    """Grayscale → blur → Canny on the GPU, downloading only the edge map."""
+    with _cuda_edges_lock:
+        if not _cuda_edge_filters:
+            _cuda_edge_filters["blur"] = cv2.cuda.createGaussianFilter(
+                cv2.CV_8UC1, cv2.CV_8UC1, (5, 5), 0
+            )
+            _cuda_edge_filters["canny"] = cv2.cuda.createCannyEdgeDetector(50, 150)
 
-        # Filter and convert to polygons
-        polygons = []
-        for contour in contours:
-            area = cv2.contourArea(contour)
-            if min_area <= area <= max_area:
-                # Approximate contour
-                epsilon = 0.02 * cv2.arcLength(contour, True)
-                approx = cv2.approxPolyDP(contour, epsilon, True)
+        gpu_frame = cv2.cuda_GpuMat()
+        gpu_frame.upload(frame)
+        gray = cv2.cuda.cvtColor(gpu_frame, cv2.COLOR_BGR2GRAY)
+        blurred = _cuda_edge_filters["blur"].apply(gray)
+        return _cuda_edge_filters["canny"].detect(blurred).download()
 
-                # Convert to list
-                polygon = [[int(point[0][0]), int(point[0][1])] for point in approx]
 
-                if len(polygon) >= 4:
-                    polygons.append({
-                        "roi": polygon,
-                        "area": float(area)
-                    })
+def _seat_edge_mask(frame: np.ndarray) -> np.ndarray:
+    """Grayscale → blur → Canny → closing, reusing buffers between stages.
 
-        return {
-            "detected": len(polygons),
-            "polygons": polygons
-        }
+    Blur and Canny run on the GPU when OpenCV has CUDA; the closing stays
+    on the CPU, where a small rect kernel is faster than a GPU launch.
+    """
+    if _CUDA_EDGES:
+        edges = _seat_edges_cuda(frame)
+    else:
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        cv2.GaussianBlur(gray, (5, 5), 0, dst=gray)
+        edges = cv2.Canny(gray, 50, 150)
+    return close_seat_edges(edges)
+
+
+def _auto_detect_seats(channel_id: int, min_area: int, max_area: int, scale: float) -> Dict:
+    """Capture a frame and find seat-like contours (blocking)."""
+    # Only read: resize/cvtColor allocate their output
+    frame = frame_cache.get_latest(channel_id, max_age_s=1.0, timeout=10, copy=False)
+    if frame is None:
+        raise HTTPException(status_code=503, detail=f"No frame available for channel {channel_id}")
+
+    # Seats are thousands of pixels; a downscaled frame keeps their contours
+    if scale != 1.0:
+        frame = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    area_scale = scale * scale
+
+    # Find contours
+    contours, _ = cv2.findContours(
+        _seat_edge_mask(frame), cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE
+    )
 
-    finally:
-        client.disconnect()
+    # Filter by area first so approxPolyDP only runs on candidates
+    areas = np.fromiter(
+        (cv2.contourArea(contour) for contour in contours),
+        dtype=np.float64, count=len(contours)
+    ) / area_scale
+    valid_idx = np.flatnonzero((areas >= min_area) & (areas <= max_area))
+
+    # 2% of the perimeter, estimated as 4·sqrt(area) (seats are roughly
+    # square) instead of an arcLength pass per contour; in frame pixels
+    epsilons = 0.02 * 4 * np.sqrt(areas[valid_idx] * area_scale)
+
+    # Approximate contours, keeping polygons with 4+ points
+    kept_idx = []
+    approxes = []
+    for i, epsilon in zip(valid_idx, epsilons):
+        approx = cv2.approxPolyDP(contours[i], float(epsilon), True)
+        if len(approx) >= 4:
+            kept_idx.append(i)
+            approxes.append(approx)
+
+    # Rescale all vertices in one buffer and convert to lists once
+    polygons = []
+    if approxes:
+        points = np.rint(np.concatenate(approxes).reshape(-1, 2) / scale).astype(int).tolist()
+        start = 0
+        for i, approx in zip(kept_idx, approxes):
+            end = start + len(approx)
+            polygons.append({"roi": points[start:end], "area": float(areas[i])})
+            start = end
+
+    return {
+        "detected": len(polygons),
+        "polygons": polygons
+    }
 
 
 @app.delete("/api/channels/{channel_id}/config")
@@ -294,13 +445,14 @@ async def delete_channel_config(channel_id: int):
     if not 1 <= channel_id <= 16:
         raise HTTPException(status_code=400, detail="Channel ID must be between 1 and 16")
 
-    config_path = get_config_path_for_channel(channel_id)
+    config_path = anyio.Path(get_config_path_for_channel(channel_id))
 
-    if not config_path.exists():
+    if not await config_path.exists():
         raise HTTPException(status_code=404, detail=f"No config found for channel {channel_id}")
 
     try:
-        config_path.unlink()
+        await config_path.unlink()
+        _invalidate_config_index()
         return {"message": f"Config deleted for channel {channel_id}"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to delete config: {str(e)}")
@@ -318,66 +470,75 @@ async def detect_persons_on_channel(channel_id: int):
 
     config_path = get_config_path_for_channel(channel_id)
 
-    if not config_path.exists():
+    if not await anyio.Path(config_path).exists():
         raise HTTPException(status_code=404, detail=f"No config found for channel {channel_id}")
 
-    rtsp_url = get_rtsp_url_for_channel(channel_id)
-    client = RTSPClient(rtsp_url)
+    frame = await run_in_threadpool(_get_frame, channel_id)
 
+    # Shared batcher: concurrent requests (and debug streams) on all
+    # channels go through one YOLO forward pass
     try:
-        # Connect to RTSP
-        if not client.connect(timeout=10):
-            raise HTTPException(status_code=503, detail=f"Failed to connect to channel {channel_id}")
-
-        # Capture frame
-        frame = client.capture_frame()
-        if frame is None:
-            raise HTTPException(status_code=500, detail="Failed to capture frame")
-
-        # Load YOLO detector
-        detector = PersonDetector(
-            model_path=settings.YOLO_MODEL,
-            confidence=settings.CONFIDENCE_THRESHOLD
-        )
-
-        # Detect persons
-        detections = detector.detect_persons(frame)
-        print(f"\n[DEBUG] Detected {len(detections)} person(s) on channel {channel_id}:")
-        for i, (x1, y1, x2, y2, conf) in enumerate(detections, 1):
-            bottom_center = ((x1 + x2) / 2, y2)
-            print(f"  Person {i}: bbox=({x1:.0f},{y1:.0f})-({x2:.0f},{y2:.0f}), bottom_center={bottom_center}, conf={conf:.2%}")
-
-        # Load ROI matcher
-        matcher = ROIMatcher(config_path)
+        detections = await asyncio.wrap_future(get_batch_server().submit(channel_id, frame))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Detection failed: {str(e)}")
 
-        # Check occupancy
-        occupancy = matcher.check_occupancy(detections, iou_threshold=settings.IOU_THRESHOLD)
+    jpeg_bytes = await run_in_threadpool(
+        _annotate_detections, channel_id, config_path, frame, detections
+    )
 
-        print(f"\n[DEBUG] Occupancy results:")
-        for seat_id, info in occupancy.items():
-            print(f"  Seat {seat_id} ({info['label']}): {info['status']} (match: {info['max_iou']:.2f})")
+    # Return both image and occupancy data
+    # For now, just return the image
+    return Response(content=jpeg_bytes, media_type="image/jpeg", headers=NO_STORE_HEADERS)
+
+
+def _get_frame(channel_id: int) -> np.ndarray:
+    """Get the latest cached frame for a channel (blocking)."""
+    # Only read: annotate_image() draws on its own copy
+    frame = frame_cache.get_latest(channel_id, max_age_s=1.0, timeout=10, copy=False)
+    if frame is None:
+        raise HTTPException(status_code=503, detail=f"No frame available for channel {channel_id}")
+    return frame
+
+
+def _annotate_detections(
+    channel_id: int,
+    config_path: Path,
+    frame: np.ndarray,
+    detections: List[Tuple[int, int, int, int, float]]
+) -> bytes:
+    """Run ROI matching on detections and return annotated JPEG (blocking)."""
+    print(f"\n[DEBUG] Detected {len(detections)} person(s) on channel {channel_id}:")
+    for i, (x1, y1, x2, y2, conf) in enumerate(detections, 1):
+        bottom_center = ((x1 + x2) / 2, y2)
+        print(f"  Person {i}: bbox=({x1:.0f},{y1:.0f})-({x2:.0f},{y2:.0f}), bottom_center={bottom_center}, conf={conf:.2%}")
+
+    # Load ROI matcher (reused until the config file changes)
+    matcher = load_roi_matcher(config_path)
+    if matcher is None:
+        raise HTTPException(status_code=404, detail=f"No config found for channel {channel_id}")
 
-        # Annotate image
-        annotated = detector.annotate_image(frame, detections)
-        annotated = matcher.visualize_rois(annotated, occupancy)
+    # Check occupancy
+    occupancy = matcher.check_occupancy(detections, iou_threshold=settings.IOU_THRESHOLD)
 
-        # Draw person bottom center points
-        for x1, y1, x2, y2, conf in detections:
-            bottom_center = (int((x1 + x2) / 2), int(y2))
-            cv2.circle(annotated, bottom_center, 10, (255, 0, 255), -1)
+    print(f"\n[DEBUG] Occupancy results:")
+    for seat_id, info in occupancy.items():
+        print(f"  Seat {seat_id} ({info['label']}): {info['status']} (match: {info['max_iou']:.2f})")
 
-        # Convert to JPEG
-        success, buffer = cv2.imencode('.jpg', annotated, [cv2.IMWRITE_JPEG_QUALITY, 85])
+    # Annotate image
+    annotated = get_detector().annotate_image(frame, detections)
+    annotated = matcher.visualize_rois(annotated, occupancy)
 
-        if not success:
-            raise HTTPException(status_code=500, detail="Failed to encode image")
+    # Draw person bottom center points
+    for x1, y1, x2, y2, conf in detections:
+        bottom_center = (int((x1 + x2) / 2), int(y2))
+        cv2.circle(annotated, bottom_center, 10, (255, 0, 255), -1)
 
-        # Return both image and occupancy data
-        # For now, just return the image
-        return StreamingResponse(io.BytesIO(buffer.tobytes()), media_type="image/jpeg")
+    # Convert to JPEG (libjpeg-turbo when available)
+    try:
+        return encode_jpeg(annotated, quality=85)
+    except ValueError:
+        raise HTTPException(status_code=500, detail="Failed to encode image")
 
-    finally:
-        client.disconnect()
 
 
 if __name__ == "__main__":
@@ -1,12 +1,15 @@
 """FastAPI endpoints for multi-store seat status and detection."""
 from fastapi import FastAPI, HTTPException, Query, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 from pydantic import BaseModel
 from typing import List, Dict, Optional, Any
 from datetime import datetime
 from pathlib import Path
 import sys
 
+import orjson
+
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
@@ -108,6 +111,54 @@ class SeatStatusUpdate(BaseModel):
     vacant_duration_seconds: int = 0
 
 
+# ============================================================================
+# Row → model helpers for list endpoints
+# ============================================================================
+# Rows come from our own Supabase tables, so list endpoints build models with
+# model_construct() instead of validating every field of every row. FastAPI
+# passes such instances through response_model validation unchanged.
+
+_STATUS_DATETIME_FIELDS = ('last_person_seen', 'last_empty_time', 'updated_at')
+
+# Columns selected for /status so DB rows already have the response shape
+_SEAT_STATUS_COLUMNS = ','.join(SeatStatusInfo.model_fields)
+
+
+def _store_from_row(row: Dict[str, Any]) -> StoreInfo:
+    return StoreInfo.model_construct(**row)
+
+
+def _seat_from_row(row: Dict[str, Any]) -> SeatInfo:
+    return SeatInfo.model_construct(
+        **row,
+        has_roi=bool(row.get('roi_polygon') and len(row['roi_polygon']) > 0)
+    )
+
+
+def _seat_status_from_row(row: Dict[str, Any]) -> SeatStatusInfo:
+    # Supabase returns timestamps as ISO strings; parse them so serialization
+    # matches the validated model
+    row = dict(row)
+    for field in _STATUS_DATETIME_FIELDS:
+        value = row.get(field)
+        if isinstance(value, str):
+            row[field] = datetime.fromisoformat(value)
+    return SeatStatusInfo.model_construct(**row)
+
+
+def _json_response(content: Any) -> Response:
+    """Serialize raw DB rows for endpoints without a response model.
+
+    Endpoints with a response_model are serialized by pydantic-core already;
+    plain dict/list payloads would otherwise go through jsonable_encoder and
+    json.dumps. orjson does both in one C pass.
+    """
+    return Response(
+        content=orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS),
+        media_type="application/json"
+    )
+
+
 # ============================================================================
 # Store Endpoints
 # ============================================================================
@@ -119,7 +170,7 @@ async def list_stores(
 ):
     """List all stores."""
     stores = db.list_stores(active_only=active_only)
-    return [StoreInfo(**store) for store in stores]
+    return [_store_from_row(store) for store in stores]
 
 
 @app.get("/api/stores/{store_id}", response_model=StoreInfo)
@@ -147,6 +198,24 @@ async def get_store_summary(
     return OccupancySummary(**summary)
 
 
+@app.get("/api/stores/{store_id}/dashboard")
+async def get_store_dashboard(
+    store_id: str,
+    db: SupabaseClient = Depends(get_supabase_client)
+):
+    """Get occupancy summary and all seat statuses in one Supabase call.
+
+    Replaces polling /summary, /status and /vacant separately; vacant seats
+    are the statuses with status == 'empty'.
+    """
+    dashboard = db.get_store_dashboard(store_id)
+    if not dashboard or not dashboard.get('summary'):
+        raise HTTPException(status_code=404, detail=f"Store {store_id} not found")
+
+    # RPC already returns the JSON document; encode without re-validation
+    return _json_response(dashboard)
+
+
 @app.post("/api/stores/{store_id}/sync-gosca")
 async def sync_gosca_seats(
     store_id: str,
@@ -226,13 +295,7 @@ async def list_seats(
     if channel_id is not None:
         seats = [s for s in seats if s.get('channel_id') == channel_id]
 
-    return [
-        SeatInfo(
-            **s,
-            has_roi=bool(s.get('roi_polygon') and len(s['roi_polygon']) > 0)
-        )
-        for s in seats
-    ]
+    return [_seat_from_row(s) for s in seats]
 
 
 @app.get("/api/stores/{store_id}/seats/{seat_id}", response_model=SeatInfo)
@@ -291,14 +354,19 @@ async def get_all_seat_statuses(
     status_filter: Optional[str] = Query(None, description="Filter by status: empty, occupied, abandoned"),
     db: SupabaseClient = Depends(get_supabase_client)
 ):
-    """Get real-time status of all seats in a store."""
-    statuses = db.get_all_seat_statuses(store_id)
+    """Get real-time status of all seats in a store.
+
+    Polled every second by the UI, so the query selects only the
+    SeatStatusInfo columns and rows are built without per-field validation
+    (status rows are validated on write, SeatStatusUpdate).
+    """
+    statuses = db.get_all_seat_statuses(store_id, columns=_SEAT_STATUS_COLUMNS)
 
     # Filter by status if specified
     if status_filter:
         statuses = [s for s in statuses if s.get('status') == status_filter]
 
-    return [SeatStatusInfo(**s) for s in statuses]
+    return [_seat_status_from_row(s) for s in statuses]
 
 
 @app.get("/api/stores/{store_id}/status/{seat_id}", response_model=SeatStatusInfo)
@@ -340,7 +408,7 @@ async def update_seat_status(
         raise HTTPException(status_code=500, detail=f"Failed to update status: {str(e)}")
 
 
-@app.get("/api/stores/{store_id}/vacant")
+@app.get("/api/stores/{store_id}/vacant", response_model=List[SeatStatusInfo])
 async def get_vacant_seats(
     store_id: str,
     min_duration: int = Query(0, description="Minimum vacant duration in seconds"),
@@ -348,17 +416,17 @@ async def get_vacant_seats(
 ):
     """Get vacant seats with optional minimum vacant duration."""
     seats = db.get_vacant_seats(store_id, min_duration_seconds=min_duration)
-    return [SeatStatusInfo(**s) for s in seats]
+    return [_seat_status_from_row(s) for s in seats]
 
 
-@app.get("/api/stores/{store_id}/abandoned")
+@app.get("/api/stores/{store_id}/abandoned", response_model=List[SeatStatusInfo])
 async def get_abandoned_seats(
     store_id: str,
     db: SupabaseClient = Depends(get_supabase_client)
 ):
     """Get seats with abandoned items."""
     seats = db.get_abandoned_seats(store_id)
-    return [SeatStatusInfo(**s) for s in seats]
+    return [_seat_status_from_row(s) for s in seats]
 
 
 # ============================================================================
@@ -390,7 +458,7 @@ async def get_store_events(
 ):
     """Get recent detection events for a store."""
     events = db.get_recent_events(store_id, limit=limit, event_type=event_type)
-    return events
+    return _json_response(events)
 
 
 @app.get("/api/stores/{store_id}/seats/{seat_id}/events")
@@ -402,7 +470,7 @@ async def get_seat_events(
 ):
     """Get detection events for a specific seat."""
     events = db.get_seat_events(store_id, seat_id, limit=limit)
-    return events
+    return _json_response(events)
 
 
 # ============================================================================
@@ -421,7 +489,7 @@ async def get_occupancy_stats(
     start_time = end_time - timedelta(hours=hours)
 
     stats = db.get_occupancy_stats(store_id, start_time, end_time)
-    return stats
+    return _json_response(stats)
 
 
 # ============================================================================
@@ -3,6 +3,7 @@ import sys
 from pathlib import Path
 import cv2
 import numpy as np
+import orjson
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -10,37 +11,67 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from src.config import settings
 from src.utils import RTSPClient
 
+# Closing with an NxN rect == (N - 1) / 4 closing iterations with 5x5, in one pass
+_CLOSE_KERNEL_LIGHT = cv2.getStructuringElement(cv2.MORPH_RECT, (5, 5))
+_CLOSE_KERNEL_STRONG = cv2.getStructuringElement(cv2.MORPH_RECT, (13, 13))
 
-def auto_detect_seats(image, min_area=5000, max_area=200000):
+
+def close_seat_edges(edges):
+    """Close gaps in a Canny edge map, as much as its edge density needs.
+
+    Dense edge maps (sharp, well-lit frames) are already connected and
+    closing would only merge neighbouring seat outlines, so it's skipped.
+    Sparse maps get a stronger closing than the default single pass.
+    Shared by this script and the auto-detect API endpoint.
+
+    Args:
+        edges: Canny edge map (uint8); closed in place
+
+    Returns:
+        The closed edge map
+    """
+    density = cv2.countNonZero(edges) / edges.size
+    if density > 0.02:
+        return edges
+    kernel = _CLOSE_KERNEL_STRONG if density < 0.005 else _CLOSE_KERNEL_LIGHT
+    return cv2.morphologyEx(edges, cv2.MORPH_CLOSE, kernel, dst=edges)
+
+
+def auto_detect_seats(image, min_area=5000, max_area=200000, scale=0.5):
     """Automatically detect seat regions from image.
 
     Args:
         image: Input image (BGR)
-        min_area: Minimum contour area to consider as a seat
-        max_area: Maximum contour area to consider as a seat
+        min_area: Minimum contour area to consider as a seat (original pixels)
+        max_area: Maximum contour area to consider as a seat (original pixels)
+        scale: Downscale factor for the detection pipeline (1.0 = full size)
 
     Returns:
-        List of polygons (each polygon is a list of [x,y] points)
+        List of polygons (each an (N, 2) int32 array of [x, y] points, original resolution)
     """
     print("\n" + "="*80)
     print("Auto-Detecting Seats")
     print("="*80)
 
+    # Seats are thousands of pixels; a downscaled frame keeps their contours
+    if scale != 1.0:
+        image = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    area_scale = scale * scale
+
     # Convert to grayscale
     gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
 
-    # Apply Gaussian blur to reduce noise
+    # Apply Gaussian blur to reduce noise (in place, single-channel)
     print("\n1. Applying Gaussian blur...")
-    blurred = cv2.GaussianBlur(gray, (5, 5), 0)
+    cv2.GaussianBlur(gray, (5, 5), 0, dst=gray)
 
     # Edge detection
     print("2. Detecting edges with Canny...")
-    edges = cv2.Canny(blurred, 50, 150)
+    edges = cv2.Canny(gray, 50, 150)
 
     # Morphological operations to close gaps
     print("3. Closing gaps with morphological operations...")
-    kernel = np.ones((5, 5), np.uint8)
-    closed = cv2.morphologyEx(edges, cv2.MORPH_CLOSE, kernel, iterations=2)
+    closed = close_seat_edges(edges)
 
     # Find contours
     print("4. Finding contours...")
@@ -49,51 +80,55 @@ def auto_detect_seats(image, min_area=5000, max_area=200000):
 
     # Filter contours by area
     print(f"5. Filtering contours (area between {min_area} and {max_area})...")
-    valid_contours = []
-    for contour in contours:
-        area = cv2.contourArea(contour)
-        if min_area <= area <= max_area:
-            valid_contours.append(contour)
+    areas = np.fromiter(
+        (cv2.contourArea(contour) for contour in contours),
+        dtype=np.float64, count=len(contours)
+    ) / area_scale
+    valid_idx = np.flatnonzero((areas >= min_area) & (areas <= max_area))
+    valid_contours = [(contours[i], areas[i]) for i in valid_idx]
 
     print(f"   {len(valid_contours)} contours passed area filter")
 
     # Approximate contours to polygons
     print("6. Approximating contours to polygons...")
     polygons = []
-    for i, contour in enumerate(valid_contours):
-        # Approximate contour to reduce number of points
-        epsilon = 0.02 * cv2.arcLength(contour, True)
+    for i, (contour, area) in enumerate(valid_contours):
+        # Approximate contour to reduce number of points; 2% of the perimeter,
+        # estimated as 4*sqrt(area) of the (downscaled) contour
+        epsilon = 0.02 * 4 * np.sqrt(area * area_scale)
         approx = cv2.approxPolyDP(contour, epsilon, True)
 
-        # Convert to list of [x, y] points
-        polygon = [[int(point[0][0]), int(point[0][1])] for point in approx]
-
         # Only keep polygons with 4+ points
-        if len(polygon) >= 4:
-            polygons.append(polygon)
-            print(f"   Polygon {i+1}: {len(polygon)} points, area={cv2.contourArea(contour):.0f}")
+        if len(approx) < 4:
+            continue
+
+        # [x, y] points at original resolution
+        polygon = np.rint(approx.reshape(-1, 2) / scale).astype(np.int32)
+        polygons.append(polygon)
+        print(f"   Polygon {i+1}: {len(polygon)} points, area={area:.0f}")
 
     print(f"\n✅ Detected {len(polygons)} potential seat regions")
     return polygons
 
 
-def visualize_detected_seats(image, polygons):
+def visualize_detected_seats(image, polygons, inplace=False):
     """Draw detected polygons on image.
 
     Args:
         image: Input image
         polygons: List of polygons to draw
+        inplace: Draw into ``image`` instead of a copy
 
     Returns:
         Annotated image
     """
-    annotated = image.copy()
+    annotated = image if inplace else image.copy()
 
-    for i, polygon in enumerate(polygons):
-        # Draw polygon
-        points = np.array(polygon, dtype=np.int32)
-        cv2.polylines(annotated, [points], isClosed=True, color=(0, 255, 0), thickness=2)
+    # Draw all polygon outlines in one call
+    all_points = [np.asarray(polygon, dtype=np.int32) for polygon in polygons]
+    cv2.polylines(annotated, all_points, isClosed=True, color=(0, 255, 0), thickness=2)
 
+    for i, points in enumerate(all_points):
         # Draw label
         x, y = points[0]
         label = f"Seat {i+1}"
@@ -115,6 +150,8 @@ def main():
     parser.add_argument('channel', type=int, help='Channel number (1-16)')
     parser.add_argument('--min-area', type=int, default=5000, help='Minimum seat area')
     parser.add_argument('--max-area', type=int, default=200000, help='Maximum seat area')
+    parser.add_argument('--scale', type=float, default=0.5,
+                        help='Downscale factor for detection (1.0 = full resolution)')
     parser.add_argument('--save', action='store_true', help='Save detected polygons to config')
 
     args = parser.parse_args()
@@ -152,7 +189,9 @@ def main():
     print(f"✅ Frame captured: {frame.shape[1]}x{frame.shape[0]}")
 
     # Auto-detect seats
-    polygons = auto_detect_seats(frame, min_area=args.min_area, max_area=args.max_area)
+    polygons = auto_detect_seats(
+        frame, min_area=args.min_area, max_area=args.max_area, scale=args.scale
+    )
 
     if not polygons:
         print("\n❌ No seats detected. Try adjusting --min-area and --max-area parameters.")
@@ -160,7 +199,8 @@ def main():
 
     # Visualize
     print("\nVisualizing detected seats...")
-    annotated = visualize_detected_seats(frame, polygons)
+    # The frame isn't needed afterwards; draw on it directly
+    annotated = visualize_detected_seats(frame, polygons, inplace=True)
 
     # Save visualization
     output_path = settings.SNAPSHOT_DIR / f"channel_{args.channel:02d}_auto_detect.jpg"
@@ -169,8 +209,6 @@ def main():
 
     # Save config if requested
     if args.save:
-        import json
-
         config_path = settings.ROI_CONFIG_DIR / f"channel_{args.channel:02d}.json"
 
         seats = []
@@ -188,8 +226,11 @@ def main():
             "seats": seats
         }
 
-        with open(config_path, 'w', encoding='utf-8') as f:
-            json.dump(config, f, ensure_ascii=False, indent=2)
+        # Serializes the int32 polygon arrays directly, no tolist()
+        with open(config_path, 'wb') as f:
+            f.write(orjson.dumps(
+                config, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2
+            ))
 
         print(f"✅ Saved config to: {config_path}")
         print(f"   {len(seats)} seats saved")
@@ -6,6 +6,7 @@ from .constants import (
     LogLevel,
     PERSON_CLASS_ID,
     EVENT_TYPE_MAP,
+    EVENT_TYPE_BY_STATUS,
     ABANDONED_THRESHOLD_SECONDS,
     RTSP_DEFAULT_TIMEOUT,
     RTSP_RECONNECT_DELAY,
@@ -22,6 +23,7 @@ __all__ = [
     'LogLevel',
     'PERSON_CLASS_ID',
     'EVENT_TYPE_MAP',
+    'EVENT_TYPE_BY_STATUS',
     'ABANDONED_THRESHOLD_SECONDS',
     'RTSP_DEFAULT_TIMEOUT',
     'RTSP_RECONNECT_DELAY',
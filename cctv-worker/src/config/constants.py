@@ -41,6 +41,13 @@ EVENT_TYPE_MAP: Final[dict] = {
     (SeatStatus.ABANDONED, SeatStatus.EMPTY): EventType.ITEM_REMOVED,
 }
 
+# Same mapping keyed on plain status strings, for the detection hot path
+# (statuses there are str values; str hashes are cached, enum hashes aren't)
+EVENT_TYPE_BY_STATUS: Final[dict] = {
+    (prev.value, new.value): event.value
+    for (prev, new), event in EVENT_TYPE_MAP.items()
+}
+
 
 # ==============================================================================
 # Thresholds and Timeouts
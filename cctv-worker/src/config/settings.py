@@ -27,12 +27,32 @@ class Settings:
     RTSP_PORT = int(os.getenv("RTSP_PORT", "554"))
     RTSP_USERNAME = os.getenv("RTSP_USERNAME", "admin")
     RTSP_PASSWORD = os.getenv("RTSP_PASSWORD", "")
+    # Let FFmpeg use a hardware decoder (NVDEC/VAAPI/...) when one is available
+    RTSP_HW_DECODE = os.getenv("RTSP_HW_DECODE", "false").lower() in ("true", "1", "yes")
+
+    # Channels served by this node (e.g. "1,2,3,4")
+    ACTIVE_CHANNELS = [
+        int(c) for c in os.getenv("ACTIVE_CHANNELS", "1,2,3,4").split(",") if c.strip()
+    ]
 
     # Model settings
     YOLO_MODEL = os.getenv("YOLO_MODEL", "yolov8n.pt")
     CONFIDENCE_THRESHOLD = float(os.getenv("CONFIDENCE_THRESHOLD", "0.5"))
     IOU_THRESHOLD = float(os.getenv("IOU_THRESHOLD", "0.3"))
 
+    # Encode debug stream JPEGs on the GPU (requires pynvjpeg + CUDA)
+    USE_NVJPEG = os.getenv("USE_NVJPEG", "false").lower() in ("true", "1", "yes")
+
+    # Skip YOLO when the mean grayscale difference (0-255) on a 64x36
+    # thumbnail vs. the last detected frame is below this (0 = always detect)
+    MOTION_THRESHOLD = float(os.getenv("MOTION_THRESHOLD", "2.0"))
+
+    # OpenCV threads for standalone scripts (default: physical cores, assuming SMT).
+    # The API server and per-channel detection workers always use 1.
+    OPENCV_NUM_THREADS = int(
+        os.getenv("OPENCV_NUM_THREADS", str(max((os.cpu_count() or 2) // 2, 1)))
+    )
+
     # Processing settings
     SNAPSHOT_INTERVAL = int(os.getenv("SNAPSHOT_INTERVAL", "3"))
     MAX_WORKERS = int(os.getenv("MAX_WORKERS", "4"))
@@ -50,6 +70,10 @@ class Settings:
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
     DRY_RUN = os.getenv("DRY_RUN", "false").lower() in ("true", "1", "yes")
 
+    def __init__(self):
+        # Credentials are fixed for the process; build the URL prefix once
+        self._rtsp_prefix = f"rtsp://{self.RTSP_USERNAME}:{self.RTSP_PASSWORD}@"
+
     def get_rtsp_url(self, host: str, port: int, channel_id: int) -> str:
         """Generate RTSP URL for a channel.
 
@@ -61,8 +85,7 @@ class Settings:
         Returns:
             Complete RTSP URL
         """
-        path = f"live_{channel_id:02d}"
-        return f"rtsp://{self.RTSP_USERNAME}:{self.RTSP_PASSWORD}@{host}:{port}/{path}"
+        return f"{self._rtsp_prefix}{host}:{port}/live_{channel_id:02d}"
 
     def ensure_directories(self):
         """Create necessary directories if they don't exist."""
@@ -1,4 +1,5 @@
 from .detector import PersonDetector
-from .roi_matcher import ROIMatcher
+from .roi_matcher import ROIMatcher, load_roi_matcher
+from .batch_inference import BatchInferenceServer
 
-__all__ = ['PersonDetector', 'ROIMatcher']
+__all__ = ['PersonDetector', 'ROIMatcher', 'load_roi_matcher', 'BatchInferenceServer']
@@ -0,0 +1,128 @@
+"""Shared YOLO inference server that batches frames from many callers."""
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .detector import PersonDetector
+
+logger = logging.getLogger(__name__)
+
+Detection = Tuple[int, int, int, int, float]
+
+
+class BatchInferenceServer:
+    """Collect detection requests from several threads into one forward pass.
+
+    Each caller submits a frame and receives a ``concurrent.futures.Future``.
+    A single background thread drains whatever requests are pending (up to
+    ``max_batch``), runs ``detector.detect_persons_batch`` once and resolves
+    every future with its own detections.
+    """
+
+    def __init__(
+        self,
+        detector: PersonDetector,
+        max_batch: int = 8,
+        max_wait: float = 0.01
+    ):
+        """Initialize batch inference server.
+
+        Args:
+            detector: Loaded person detector
+            max_batch: Maximum number of frames per forward pass
+            max_wait: Seconds to wait for more requests after the first one
+        """
+        self.detector = detector
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max_wait
+
+        self._queue: "queue.Queue[Tuple[int, np.ndarray, Future]]" = queue.Queue()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Start the background inference thread (idempotent)."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="batch-inference", daemon=True
+            )
+            self._thread.start()
+            logger.info("Batch inference server started (max_batch=%d)", self.max_batch)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the background thread and fail any pending requests."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+        while True:
+            try:
+                _, _, future = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            future.set_exception(RuntimeError("Batch inference server stopped"))
+
+    def submit(self, channel_id: int, frame: np.ndarray) -> "Future[List[Detection]]":
+        """Queue a frame for detection.
+
+        Args:
+            channel_id: Channel the frame came from (for logging)
+            frame: Input image (BGR format)
+
+        Returns:
+            Future resolving to the list of (x1, y1, x2, y2, confidence)
+        """
+        if self._thread is None or not self._thread.is_alive():
+            self.start()
+
+        future: Future = Future()
+        self._queue.put((channel_id, frame, future))
+        return future
+
+    def _collect_batch(self) -> List[Tuple[int, np.ndarray, Future]]:
+        """Block for one request, then drain pending ones up to max_batch."""
+        try:
+            first = self._queue.get(timeout=0.5)
+        except queue.Empty:
+            return []
+
+        batch = [first]
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self._queue.get(timeout=self.max_wait))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        """Background loop: collect, infer, resolve."""
+        while not self._stop_event.is_set():
+            batch = self._collect_batch()
+            if not batch:
+                continue
+
+            # Drop requests whose caller already gave up
+            batch = [item for item in batch if item[2].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            frames = [frame for _, frame, _ in batch]
+            try:
+                results = self.detector.detect_persons_batch(frames)
+            except Exception as e:
+                logger.error("Batch inference failed (%d frames): %s", len(frames), e)
+                for _, _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            for (_, _, future), detections in zip(batch, results):
+                future.set_result(detections)
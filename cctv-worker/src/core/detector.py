@@ -15,33 +15,91 @@ logger = logging.getLogger(__name__)
 class PersonDetector:
     """Person detector using YOLOv8."""
 
-    def __init__(self, model_path: str = "yolov8n.pt", confidence: float = 0.5):
+    def __init__(
+        self,
+        model_path: str = "yolov8n.pt",
+        confidence: float = 0.5,
+        prefer_exported: bool = True
+    ):
         """Initialize person detector.
 
         Args:
             model_path: Path to YOLO model file
             confidence: Confidence threshold for detection (0-1)
+            prefer_exported: Load an exported TensorRT/OpenVINO/ONNX variant
+                of a .pt model when one exists next to it
+                (see scripts/download_model.py --export)
         """
         if YOLO is None:
             raise ImportError(
                 "ultralytics not installed. Run: pip install ultralytics"
             )
 
-        self.model_path = model_path
+        self.model_path = (
+            self.resolve_model_path(model_path) if prefer_exported else model_path
+        )
         self.confidence = confidence
         self.model: Optional[YOLO] = None
+        self.half = False
         self._load_model()
 
+    @staticmethod
+    def resolve_model_path(model_path: str) -> str:
+        """Pick the fastest available export of a .pt model.
+
+        With CUDA only a TensorRT ``.engine`` is used; otherwise the .pt
+        runs on the GPU (FP16), since the CPU-oriented exports would move
+        inference off the GPU. Without CUDA the order is OpenVINO
+        ``_openvino_model/`` directory, INT8 ``_int8.onnx``, then ``.onnx``.
+        Falls back to the original path when no matching export exists.
+
+        Args:
+            model_path: Path to the .pt model
+
+        Returns:
+            Model path to load
+        """
+        path = Path(model_path)
+        if path.suffix != ".pt":
+            return model_path
+
+        if PersonDetector._cuda_available():
+            candidates = [path.with_suffix(".engine")]
+        else:
+            candidates = [
+                path.parent / f"{path.stem}_openvino_model",
+                path.parent / f"{path.stem}_int8.onnx",
+                path.with_suffix(".onnx"),
+            ]
+
+        for candidate in candidates:
+            if candidate.exists():
+                logger.info("Using exported model %s instead of %s", candidate, model_path)
+                return str(candidate)
+        return model_path
+
     def _load_model(self) -> None:
         """Load YOLO model."""
         try:
             logger.info("Loading YOLO model: %s", self.model_path)
-            self.model = YOLO(self.model_path)
-            logger.info("Model loaded successfully")
+            # Exported models need the task explicitly
+            self.model = YOLO(self.model_path, task="detect")
+            # FP16 for PyTorch weights on GPU; exported models carry their
+            # own precision (TensorRT FP16, OpenVINO/ONNX INT8 or FP32)
+            self.half = self.model_path.endswith(".pt") and self._cuda_available()
+            logger.info("Model loaded successfully (half=%s)", self.half)
         except Exception as e:
             logger.error("Failed to load model: %s", e)
             raise
 
+    @staticmethod
+    def _cuda_available() -> bool:
+        try:
+            import torch
+            return torch.cuda.is_available()
+        except ImportError:
+            return False
+
     def detect_persons(
         self, image: np.ndarray, visualize: bool = False
     ) -> List[Tuple[int, int, int, int, float]]:
@@ -58,37 +116,73 @@ class PersonDetector:
             raise RuntimeError("Model not loaded")
 
         # Run inference
-        results = self.model(image, conf=self.confidence, verbose=False)
+        results = self.model(image, conf=self.confidence, half=self.half, verbose=False)
 
         detections = []
         for result in results:
-            boxes = result.boxes
-
-            # Filter for person class (class_id = 0 in COCO dataset)
-            for box in boxes:
-                class_id = int(box.cls[0])
-                if class_id == 0:  # Person class
-                    x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                    conf = float(box.conf[0])
-                    detections.append((int(x1), int(y1), int(x2), int(y2), conf))
+            detections.extend(self._parse_result(result))
 
         return detections
 
+    def detect_persons_batch(
+        self, images: List[np.ndarray]
+    ) -> List[List[Tuple[int, int, int, int, float]]]:
+        """Detect persons in several images with a single forward pass.
+
+        Args:
+            images: Input images (BGR format)
+
+        Returns:
+            One detection list per input image, in the same order
+        """
+        if self.model is None:
+            raise RuntimeError("Model not loaded")
+
+        if not images:
+            return []
+
+        # Ultralytics batches a list of arrays into one inference call
+        results = self.model(
+            list(images), conf=self.confidence, half=self.half, verbose=False
+        )
+
+        return [self._parse_result(result) for result in results]
+
+    @staticmethod
+    def _parse_result(result) -> List[Tuple[int, int, int, int, float]]:
+        """Extract person boxes from a single Ultralytics result."""
+        # One device->host copy of all boxes: (N, 6) = x1, y1, x2, y2, conf, cls
+        data = result.boxes.data.cpu().numpy()
+
+        # Filter for person class (class_id = 0 in COCO dataset)
+        persons = data[data[:, 5].astype(np.int32) == 0]
+        coords = persons[:, :4].astype(np.int32).tolist()
+        confs = persons[:, 4].tolist()
+
+        return [
+            (x1, y1, x2, y2, conf)
+            for (x1, y1, x2, y2), conf in zip(coords, confs)
+        ]
+
     def annotate_image(
-        self, image: np.ndarray, detections: List[Tuple[int, int, int, int, float]]
+        self,
+        image: np.ndarray,
+        detections: List[Tuple[int, int, int, int, float]],
+        inplace: bool = False
     ) -> np.ndarray:
         """Draw bounding boxes on image.
 
         Args:
             image: Input image
             detections: List of detections from detect_persons()
+            inplace: Draw directly into ``image`` instead of a copy
 
         Returns:
             Annotated image
         """
         import cv2
 
-        annotated = image.copy()
+        annotated = image if inplace else image.copy()
 
         for x1, y1, x2, y2, conf in detections:
             # Draw rectangle
@@ -123,4 +217,5 @@ class PersonDetector:
             "model_path": self.model_path,
             "confidence": self.confidence,
             "device": str(self.model.device),
+            "half": self.half,
         }
@@ -1,10 +1,13 @@
 """ROI (Region of Interest) matching for seat occupancy detection."""
-import json
 import logging
+import threading
 import numpy as np
+import orjson
 from typing import List, Tuple, Dict, Union, Optional
 from pathlib import Path
 
+from ..utils.file_io import write_bytes_atomic
+
 logger = logging.getLogger(__name__)
 
 
@@ -21,6 +24,12 @@ class ROIMatcher:
         self.seats = []
         self.camera_id = None
         self.resolution = None
+        # Rectangle seat boxes / polygon edges as arrays, rebuilt lazily
+        # when seats change
+        self._rect_cache: Optional[Tuple[List[int], np.ndarray, np.ndarray]] = None
+        self._poly_cache: Optional[Tuple[List[int], List[np.ndarray], np.ndarray, np.ndarray]] = None
+        self._poly_bounds: Optional[np.ndarray] = None
+        self._seat_meta: Optional[Tuple[List[str], List[str]]] = None
 
         if roi_config is not None:
             if isinstance(roi_config, dict):
@@ -40,6 +49,7 @@ class ROIMatcher:
         self.camera_id = config.get('camera_id')
         self.resolution = config.get('resolution')
         self.seats = config.get('seats', [])
+        self._invalidate_cache()
 
         logger.info("Loaded ROI config: %d seats", len(self.seats))
 
@@ -60,8 +70,7 @@ class ROIMatcher:
         }
         """
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config = json.load(f)
+            config = orjson.loads(Path(config_path).read_bytes())
 
             self.load_from_dict(config)
 
@@ -82,8 +91,12 @@ class ROIMatcher:
         }
 
         try:
-            with open(config_path, 'w', encoding='utf-8') as f:
-                json.dump(config, f, ensure_ascii=False, indent=2)
+            payload = orjson.dumps(
+                config, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            )
+
+            # Readers never see a partially written config
+            write_bytes_atomic(config_path, payload)
             logger.info("Saved ROI config to: %s", config_path)
 
         except Exception as e:
@@ -155,100 +168,293 @@ class ROIMatcher:
 
         return inside
 
+    @staticmethod
+    def calculate_iou_matrix(
+        boxes1: np.ndarray,
+        boxes2: np.ndarray,
+        areas1: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Calculate pairwise IoU between two sets of boxes.
+
+        Args:
+            boxes1: (N, 4) array of (x1, y1, x2, y2)
+            boxes2: (M, 4) array of (x1, y1, x2, y2)
+            areas1: Precomputed (N,) areas of boxes1 (e.g. cached seat areas)
+
+        Returns:
+            (N, M) IoU matrix; float32 if both box arrays are float32,
+            float64 otherwise
+        """
+        # float32 is exact for pixel coordinates and areas up to 4K frames
+        # and halves the memory traffic, so keep it when callers pass it
+        dtype = np.result_type(np.asarray(boxes1).dtype, np.asarray(boxes2).dtype, np.float32)
+        boxes1 = np.asarray(boxes1, dtype=dtype).reshape(-1, 4)
+        boxes2 = np.asarray(boxes2, dtype=dtype).reshape(-1, 4)
+
+        # Two (N, M) buffers, updated in place: width/height of the overlap,
+        # then intersection/union, then IoU
+        inter = np.minimum.outer(boxes1[:, 2], boxes2[:, 2])
+        inter -= np.maximum.outer(boxes1[:, 0], boxes2[:, 0])
+        union = np.minimum.outer(boxes1[:, 3], boxes2[:, 3])
+        union -= np.maximum.outer(boxes1[:, 1], boxes2[:, 1])
+        np.maximum(inter, 0, out=inter)
+        np.maximum(union, 0, out=union)
+        inter *= union
+
+        if areas1 is None:
+            areas1 = (boxes1[:, 2] - boxes1[:, 0]) * (boxes1[:, 3] - boxes1[:, 1])
+        area2 = (boxes2[:, 2] - boxes2[:, 0]) * (boxes2[:, 3] - boxes2[:, 1])
+        np.add.outer(areas1, area2, out=union)
+        union -= inter
+
+        # Zero union means zero intersection too, so those entries stay 0
+        np.divide(inter, union, out=inter, where=union != 0)
+        return inter
+
+    @staticmethod
+    def points_in_polygons(
+        points: np.ndarray,
+        edges: np.ndarray,
+        offsets: np.ndarray
+    ) -> np.ndarray:
+        """Vectorized point_in_polygon() for many points and polygons.
+
+        Polygons are passed as one flat edge array (structure of arrays)
+        instead of per-seat vertex lists, so every point/edge pair is tested
+        in a single NumPy pass with the same rules as point_in_polygon().
+
+        Args:
+            points: (D, 2) array of (x, y)
+            edges: (E, 4) array of (p1x, p1y, p2x, p2y), polygons concatenated
+            offsets: (P,) index of each polygon's first edge in ``edges``
+
+        Returns:
+            (P, D) boolean array, True where the point is inside the polygon
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        if len(offsets) == 0 or len(points) == 0:
+            return np.zeros((len(offsets), len(points)), dtype=bool)
+
+        x = points[None, :, 0]
+        y = points[None, :, 1]
+        p1x, p1y, p2x, p2y = (edges[:, i, None] for i in range(4))
+
+        # Edge straddles the ray's y: same as min(p1y, p2y) < y <= max(p1y, p2y)
+        straddles = (p1y < y) != (p2y < y)
+
+        # Entries where the edge is horizontal are masked by ``straddles``.
+        # The x <= max(p1x, p2x) check is implied, since xinters lies between
+        # p1x and p2x for straddling edges, and vertical edges give xinters == p1x.
+        dy = p2y - p1y
+        xinters = np.empty(np.broadcast_shapes(dy.shape, y.shape))
+        np.divide((y - p1y) * (p2x - p1x), dy, out=xinters, where=dy != 0)
+        xinters += p1x
+
+        crosses = straddles & (x <= xinters)
+        # Odd number of crossings per polygon = inside
+        return np.bitwise_xor.reduceat(crosses, offsets, axis=0)
+
+    def _invalidate_cache(self) -> None:
+        self._rect_cache = None
+        self._poly_cache = None
+        self._poly_bounds = None
+        self._seat_meta = None
+
+    def _get_poly_seats(self) -> Tuple[List[int], List[np.ndarray], np.ndarray, np.ndarray]:
+        """Polygon seats as int32 vertex arrays plus a flat edge table (cached).
+
+        Returns:
+            (seat indices, per-seat (K, 2) int32 vertices, (E, 4) edges,
+            (P,) edge offsets)
+        """
+        if self._poly_cache is None:
+            indices = []
+            vertices = []
+            edges = []
+            offsets = []
+            edge_count = 0
+            for i, seat in enumerate(self.seats):
+                if seat.get('type', 'rectangle') != 'polygon' or not seat['roi']:
+                    continue
+                points = np.asarray(seat['roi'], dtype=np.float64).reshape(-1, 2)
+                # Edge k runs from vertex k-1 to vertex k, wrapping around
+                start = np.roll(points, 1, axis=0)
+                indices.append(i)
+                vertices.append(points.astype(np.int32))
+                edges.append(np.hstack([start, points]))
+                offsets.append(edge_count)
+                edge_count += len(points)
+
+            self._poly_cache = (
+                indices,
+                vertices,
+                np.concatenate(edges) if edges else np.zeros((0, 4)),
+                np.asarray(offsets, dtype=np.intp)
+            )
+        return self._poly_cache
+
+    def _get_seat_meta(self) -> Tuple[List[str], List[str]]:
+        """Seat ids and display labels (cached)."""
+        if self._seat_meta is None:
+            ids = [seat['id'] for seat in self.seats]
+            labels = [
+                seat.get('label', f'Seat {seat_id}')
+                for seat, seat_id in zip(self.seats, ids)
+            ]
+            self._seat_meta = (ids, labels)
+        return self._seat_meta
+
+    def _get_poly_bounds(self) -> np.ndarray:
+        """(P, 4) axis-aligned bounding boxes of the polygon seats (cached)."""
+        if self._poly_bounds is None:
+            _, vertices, _, _ = self._get_poly_seats()
+            self._poly_bounds = np.asarray(
+                [np.concatenate([v.min(axis=0), v.max(axis=0)]) for v in vertices],
+                dtype=np.float64
+            ).reshape(-1, 4)
+        return self._poly_bounds
+
+    def _get_rect_seats(self) -> Tuple[List[int], np.ndarray, np.ndarray]:
+        """Indices, (S, 4) boxes and (S,) areas of rectangle seats (cached)."""
+        if self._rect_cache is None:
+            indices = [
+                i for i, seat in enumerate(self.seats)
+                if seat.get('type', 'rectangle') != 'polygon'
+            ]
+            boxes = np.asarray(
+                [self.seats[i]['roi'] for i in indices], dtype=np.float32
+            ).reshape(-1, 4)
+            areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+            self._rect_cache = (indices, boxes, areas)
+        return self._rect_cache
+
     def check_occupancy(
         self,
-        person_detections: List[Tuple[int, int, int, int, float]],
+        person_detections: Union[np.ndarray, List[Tuple[int, int, int, int, float]]],
         iou_threshold: float = 0.3
     ) -> Dict[str, str]:
         """Check seat occupancy based on person detections.
 
         Args:
-            person_detections: List of (x1, y1, x2, y2, confidence) from YOLO
+            person_detections: List of (x1, y1, x2, y2, confidence) from YOLO,
+                or an equivalent (P, 5) array (used without conversion)
             iou_threshold: Minimum IoU to consider seat occupied
 
         Returns:
             Dictionary mapping seat_id to status ("occupied" or "empty")
         """
-        results = {}
-
-        for seat in self.seats:
-            seat_id = seat['id']
-            seat_type = seat.get('type', 'rectangle')
-
-            occupied = False
-            max_iou = 0.0
-
-            if seat_type == 'polygon':
-                # Polygon-based detection: check if person's bottom center is in polygon
-                polygon = seat['roi']
-
-                for person_box in person_detections:
-                    x1, y1, x2, y2 = person_box[:4]
-                    # Person's bottom center point (where their feet are)
-                    person_bottom_center = ((x1 + x2) / 2, y2)
-
-                    if self.point_in_polygon(person_bottom_center, polygon):
-                        occupied = True
-                        max_iou = 1.0  # Full match
-                        break
-            else:
-                # Rectangle-based detection: use IoU
-                seat_box = tuple(seat['roi'])  # (x1, y1, x2, y2)
-
-                for person_box in person_detections:
-                    person_bbox = person_box[:4]
-                    iou = self.calculate_iou(person_bbox, seat_box)
+        seat_ids, seat_labels = self._get_seat_meta()
+
+        # Idle frames: every seat is empty, skip the geometry entirely
+        if len(person_detections) == 0:
+            return {
+                seat_id: {
+                    'status': 'empty',
+                    'max_iou': 0.0,
+                    'label': label,
+                    'matched_detection': None
+                }
+                for seat_id, label in zip(seat_ids, seat_labels)
+            }
 
-                    if iou > max_iou:
-                        max_iou = iou
+        # (P, 4) detection boxes, shared by the rectangle and polygon checks
+        if isinstance(person_detections, np.ndarray):
+            person_boxes = person_detections[:, :4]
+        else:
+            person_boxes = np.asarray(
+                [box[:4] for box in person_detections], dtype=np.float32
+            ).reshape(-1, 4)
+
+        # (max_iou, matched detection index) per seat, filled by the rectangle
+        # and polygon passes below; unmatched seats keep the default
+        matches: List[Tuple[float, Optional[int]]] = [(0.0, None)] * len(seat_ids)
+
+        # IoU of every rectangle seat against every detection in one shot
+        rect_indices, seat_boxes, seat_areas = self._get_rect_seats()
+        if rect_indices:
+            iou_matrix = self.calculate_iou_matrix(seat_boxes, person_boxes, seat_areas)
+            above = iou_matrix > iou_threshold
+            # First matching detection, as in a sequential scan, and the best
+            # IoU seen up to it (or over all detections when nothing matched)
+            first = np.argmax(above, axis=1)
+            matched = above[np.arange(len(first)), first]
+            prefix_max = np.maximum.accumulate(iou_matrix, axis=1)
+            max_ious = np.where(
+                matched, prefix_max[np.arange(len(first)), first], prefix_max[:, -1]
+            )
+            for seat_index, max_iou, match, ok in zip(
+                rect_indices, max_ious.tolist(), first.tolist(), matched.tolist()
+            ):
+                matches[seat_index] = (max_iou, match if ok else None)
+
+        # Bottom center (feet) of every detection against every polygon seat
+        poly_indices, _, poly_edges, poly_offsets = self._get_poly_seats()
+        if poly_indices:
+            # (P, 2) feet points, filled in place
+            bottom_centers = np.empty((len(person_boxes), 2))
+            np.add(person_boxes[:, 0], person_boxes[:, 2], out=bottom_centers[:, 0])
+            bottom_centers[:, 0] *= 0.5
+            bottom_centers[:, 1] = person_boxes[:, 3]
+            # Cheap bounding-box test first; only points inside some polygon's
+            # box go through the ray cast
+            bounds = self._get_poly_bounds()
+            x = bottom_centers[None, :, 0]
+            y = bottom_centers[None, :, 1]
+            in_box = (
+                (x >= bounds[:, 0, None]) & (x <= bounds[:, 2, None])
+                & (y >= bounds[:, 1, None]) & (y <= bounds[:, 3, None])
+            )
+            candidates = np.flatnonzero(in_box.any(axis=0))
+
+            inside = np.zeros_like(in_box)
+            if candidates.size:
+                inside[:, candidates] = self.points_in_polygons(
+                    bottom_centers[candidates], poly_edges, poly_offsets
+                )
+            # First person whose bottom center is inside counts as a full match
+            rows = np.flatnonzero(inside.any(axis=1))
+            firsts = np.argmax(inside[rows], axis=1)
+            for row, match in zip(rows.tolist(), firsts.tolist()):
+                matches[poly_indices[row]] = (1.0, match)
 
-                    if iou > iou_threshold:
-                        occupied = True
-                        break
+        results = {}
+        for seat_id, label, (max_iou, match) in zip(seat_ids, seat_labels, matches):
+            occupied = match is not None
 
             # Store matched detection for event logging
-            matched_detection = None
-            if occupied and person_detections:
-                # Find the detection that matched this seat
-                for person_box in person_detections:
-                    if seat_type == 'polygon':
-                        x1, y1, x2, y2 = person_box[:4]
-                        person_bottom_center = ((x1 + x2) / 2, y2)
-                        if self.point_in_polygon(person_bottom_center, seat['roi']):
-                            matched_detection = person_box
-                            break
-                    else:
-                        person_bbox = person_box[:4]
-                        iou = self.calculate_iou(person_bbox, tuple(seat['roi']))
-                        if iou > iou_threshold:
-                            matched_detection = person_box
-                            break
+            matched_detection = person_detections[match] if occupied else None
+            if isinstance(matched_detection, np.ndarray):
+                matched_detection = tuple(matched_detection.tolist())
 
             results[seat_id] = {
                 'status': 'occupied' if occupied else 'empty',
                 'max_iou': max_iou,
-                'label': seat.get('label', f'Seat {seat_id}'),
+                'label': label,
                 'matched_detection': matched_detection
             }
 
         return results
 
     def visualize_rois(self, image: np.ndarray,
-                       occupancy_status: Dict[str, Dict] = None) -> np.ndarray:
+                       occupancy_status: Dict[str, Dict] = None,
+                       inplace: bool = False) -> np.ndarray:
         """Draw ROI boxes/polygons on image.
 
         Args:
             image: Input image
             occupancy_status: Optional occupancy status from check_occupancy()
+            inplace: Draw directly into ``image`` instead of a copy
 
         Returns:
             Image with ROIs drawn
         """
         import cv2
 
-        annotated = image.copy()
+        annotated = image if inplace else image.copy()
+        poly_indices, poly_vertices, _, _ = self._get_poly_seats()
+        poly_points = dict(zip(poly_indices, poly_vertices))
 
-        for seat in self.seats:
+        for seat_index, seat in enumerate(self.seats):
             seat_id = seat['id']
             seat_type = seat.get('type', 'rectangle')
             label = seat.get('label', f'Seat {seat_id}')
@@ -263,7 +469,9 @@ class ROIMatcher:
 
             if seat_type == 'polygon':
                 # Draw polygon
-                points = np.array(seat['roi'], dtype=np.int32)
+                points = poly_points.get(seat_index)
+                if points is None:
+                    continue
                 cv2.polylines(annotated, [points], isClosed=True, color=color, thickness=2)
 
                 # Label at first point
@@ -301,6 +509,7 @@ class ROIMatcher:
             'label': label or f'{seat_id}번 좌석'
         }
         self.seats.append(seat)
+        self._invalidate_cache()
 
     def remove_seat(self, seat_id: str) -> bool:
         """Remove a seat by ID.
@@ -314,5 +523,44 @@ class ROIMatcher:
         for i, seat in enumerate(self.seats):
             if seat['id'] == seat_id:
                 self.seats.pop(i)
+                self._invalidate_cache()
                 return True
         return False
+
+
+# Matchers loaded from JSON, keyed by path and reused until the file changes
+_file_matchers: Dict[Path, Tuple[Tuple[int, int], ROIMatcher]] = {}
+_file_matchers_lock = threading.Lock()
+
+
+def load_roi_matcher(config_path: Union[Path, str]) -> Optional[ROIMatcher]:
+    """Load an ROIMatcher from JSON, cached by file modification time.
+
+    The cache key is (st_mtime_ns, st_size) so a config rewritten within
+    the filesystem's timestamp granularity is still picked up when its
+    size changed.
+
+    Args:
+        config_path: Path to ROI config file
+
+    Returns:
+        Cached or freshly loaded ROIMatcher, or None if the file is missing
+    """
+    config_path = Path(config_path)
+    try:
+        stat = config_path.stat()
+    except FileNotFoundError:
+        with _file_matchers_lock:
+            _file_matchers.pop(config_path, None)
+        return None
+
+    version = (stat.st_mtime_ns, stat.st_size)
+    with _file_matchers_lock:
+        cached = _file_matchers.get(config_path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+    matcher = ROIMatcher(config_path)
+    with _file_matchers_lock:
+        _file_matchers[config_path] = (version, matcher)
+    return matcher
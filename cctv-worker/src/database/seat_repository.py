@@ -10,6 +10,9 @@ from pathlib import Path
 from typing import List, Dict, Optional, Any
 from threading import Lock
 
+import orjson
+
+from ..utils.file_io import write_bytes_atomic
 from .supabase_client import get_supabase_client, SupabaseClient
 
 logger = logging.getLogger(__name__)
@@ -19,9 +22,12 @@ class SeatRepository:
     """좌석 ROI 정보 조회 - 캐싱 및 Fallback 포함."""
 
     # 클래스 레벨 캐시 (모든 인스턴스 공유)
+    # 읽기는 lock 없이 dict.get (CPython에서 원자적), 쓰기/순회만 _cache_lock 사용
     _cache: Dict[str, Dict[str, Any]] = {}
     _cache_lock = Lock()
     _cache_ttl = 60  # 60초 캐시 (ROI는 자주 변경되지 않음)
+    # 키별 갱신 lock: 만료 시 같은 키는 한 스레드만 Supabase 조회 (thundering herd 방지)
+    _key_locks: Dict[str, Lock] = {}
 
     def __init__(self, fallback_dir: Optional[Path] = None):
         """Initialize repository.
@@ -32,6 +38,30 @@ class SeatRepository:
         self._client: Optional[SupabaseClient] = None
         self.fallback_dir = fallback_dir or Path("data/roi_configs")
 
+    @classmethod
+    def _get_fresh(cls, cache_key: str) -> Optional[List[Dict[str, Any]]]:
+        """TTL 이내의 캐시 데이터 조회 (lock 없음).
+
+        Args:
+            cache_key: 캐시 키
+
+        Returns:
+            캐시된 좌석 데이터 또는 None (없거나 만료)
+        """
+        entry = cls._cache.get(cache_key)
+        if entry is not None and time.time() - entry['timestamp'] < cls._cache_ttl:
+            return entry['data']
+        return None
+
+    @classmethod
+    def _get_key_lock(cls, cache_key: str) -> Lock:
+        """캐시 키별 갱신 lock 조회 (없으면 생성)."""
+        lock = cls._key_locks.get(cache_key)
+        if lock is None:
+            with cls._cache_lock:
+                lock = cls._key_locks.setdefault(cache_key, Lock())
+        return lock
+
     @property
     def client(self) -> SupabaseClient:
         """Lazy initialization of Supabase client."""
@@ -65,52 +95,113 @@ class SeatRepository:
         cache_key = f"{store_id}:{channel_id}"
 
         # 1. 캐시 확인
-        with self._cache_lock:
-            if cache_key in self._cache:
-                entry = self._cache[cache_key]
-                if time.time() - entry['timestamp'] < self._cache_ttl:
-                    logger.debug(f"Cache hit: {cache_key}")
-                    return entry['data']
-                else:
-                    logger.debug(f"Cache expired: {cache_key}")
+        data = self._get_fresh(cache_key)
+        if data is not None:
+            logger.debug(f"Cache hit: {cache_key}")
+            return data
 
-        # 2. Supabase 조회 시도
+        with self._get_key_lock(cache_key):
+            # 대기 중 다른 스레드가 갱신했으면 그 결과 사용
+            data = self._get_fresh(cache_key)
+            if data is not None:
+                return data
+            logger.debug(f"Cache expired: {cache_key}")
+            return self._fetch_channel_seats(store_id, [channel_id])[channel_id]
+
+    def get_seats_by_channels(
+        self, store_id: str, channel_ids: List[int]
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """여러 채널의 좌석 ROI를 한 번에 조회 (캐시 우선).
+
+        캐시에 없는 채널만 모아 Supabase에 한 번의 ``in_`` 쿼리로 요청하고,
+        결과를 채널별로 나눠 캐시에 넣는다.
+
+        Args:
+            store_id: 지점 ID
+            channel_ids: CCTV 채널 번호 리스트
+
+        Returns:
+            {channel_id: 좌석 정보 리스트}, 유효하지 않은 채널은 제외
+        """
+        if not isinstance(store_id, str) or not store_id:
+            logger.warning(f"Invalid store_id: {store_id}")
+            return {}
+
+        result: Dict[int, List[Dict[str, Any]]] = {}
+        missing: List[int] = []
+        for channel_id in dict.fromkeys(channel_ids):
+            if not isinstance(channel_id, int) or channel_id < 0:
+                logger.warning(f"Invalid channel_id: {channel_id}")
+                continue
+            data = self._get_fresh(f"{store_id}:{channel_id}")
+            if data is not None:
+                result[channel_id] = data
+            else:
+                missing.append(channel_id)
+
+        if missing:
+            result.update(self._fetch_channel_seats(store_id, missing))
+        return result
+
+    def _fetch_channel_seats(
+        self, store_id: str, channel_ids: List[int]
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """채널 좌석 Supabase 일괄 조회 후 캐시 갱신 (실패 시 채널별 fallback)."""
+        # 2. Supabase 조회 시도 (채널 수와 무관하게 1회 왕복)
         try:
             response = (
                 self.client.client.table('seats')
                 .select('seat_id, roi_polygon, seat_label, channel_id')
                 .eq('store_id', store_id)
-                .eq('channel_id', channel_id)
+                .in_('channel_id', channel_ids)
                 .eq('is_active', True)
                 .execute()
             )
-            data = response.data or []
+            by_channel: Dict[int, List[Dict[str, Any]]] = {
+                channel_id: [] for channel_id in channel_ids
+            }
+            for seat in response.data or []:
+                # channel_id는 분류용으로만 조회 → 캐시/fallback 행 형식은 기존과 동일
+                seats = by_channel.get(seat.pop('channel_id', None))
+                if seats is not None:
+                    seats.append(seat)
 
             # 캐시 업데이트
+            now = time.time()
             with self._cache_lock:
-                self._cache[cache_key] = {
-                    'data': data,
-                    'timestamp': time.time()
-                }
+                for channel_id, data in by_channel.items():
+                    self._cache[f"{store_id}:{channel_id}"] = {
+                        'data': data,
+                        'timestamp': now
+                    }
 
             # Fallback JSON도 업데이트 (다음 에러 대비)
-            if data:
-                self._save_fallback(cache_key, data)
+            for channel_id, data in by_channel.items():
+                if data:
+                    self._save_fallback(f"{store_id}:{channel_id}", data)
 
-            logger.debug(f"Supabase 조회 성공: {cache_key}, {len(data)} seats")
-            return data
+            logger.debug(
+                f"Supabase 조회 성공: {store_id} channels={channel_ids}, "
+                f"{sum(len(d) for d in by_channel.values())} seats"
+            )
+            return by_channel
 
         except Exception as e:
             logger.warning(f"Supabase 조회 실패: {e}, fallback 사용")
 
-            # 3. 만료된 캐시라도 있으면 사용 (stale cache)
-            with self._cache_lock:
-                if cache_key in self._cache:
-                    logger.info(f"Stale cache 사용: {cache_key}")
-                    return self._cache[cache_key]['data']
+            by_channel = {}
+            for channel_id in channel_ids:
+                cache_key = f"{store_id}:{channel_id}"
 
-            # 4. 로컬 JSON fallback
-            return self._load_fallback(cache_key)
+                # 3. 만료된 캐시라도 있으면 사용 (stale cache)
+                entry = self._cache.get(cache_key)
+                if entry is not None:
+                    logger.info(f"Stale cache 사용: {cache_key}")
+                    by_channel[channel_id] = entry['data']
+                else:
+                    # 4. 로컬 JSON fallback
+                    by_channel[channel_id] = self._load_fallback(cache_key)
+            return by_channel
 
     def get_all_seats_for_store(self, store_id: str) -> List[Dict[str, Any]]:
         """지점의 모든 좌석 조회 (채널 무관).
@@ -129,13 +220,19 @@ class SeatRepository:
         cache_key = f"{store_id}:all"
 
         # 1. 캐시 확인
-        with self._cache_lock:
-            if cache_key in self._cache:
-                entry = self._cache[cache_key]
-                if time.time() - entry['timestamp'] < self._cache_ttl:
-                    logger.debug(f"Cache hit: {cache_key}")
-                    return entry['data']
+        data = self._get_fresh(cache_key)
+        if data is not None:
+            logger.debug(f"Cache hit: {cache_key}")
+            return data
 
+        with self._get_key_lock(cache_key):
+            data = self._get_fresh(cache_key)
+            if data is not None:
+                return data
+            return self._fetch_store_seats(store_id, cache_key)
+
+    def _fetch_store_seats(self, store_id: str, cache_key: str) -> List[Dict[str, Any]]:
+        """지점 전체 좌석 Supabase 조회 후 캐시 갱신 (실패 시 fallback)."""
         # 2. Supabase 조회 시도
         try:
             response = (
@@ -164,10 +261,10 @@ class SeatRepository:
             logger.warning(f"전체 좌석 조회 실패: {e}, fallback 사용")
 
             # 3. 만료된 캐시라도 있으면 사용
-            with self._cache_lock:
-                if cache_key in self._cache:
-                    logger.info(f"Stale cache 사용: {cache_key}")
-                    return self._cache[cache_key]['data']
+            entry = self._cache.get(cache_key)
+            if entry is not None:
+                logger.info(f"Stale cache 사용: {cache_key}")
+                return entry['data']
 
             # 4. 로컬 JSON fallback
             return self._load_fallback(cache_key)
@@ -184,8 +281,9 @@ class SeatRepository:
             # ':' 를 '_'로 변환하여 파일명 생성
             safe_filename = cache_key.replace(':', '_')
             path = self.fallback_dir / f"{safe_filename}.json"
-            with open(path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+            # 임시 파일 + fsync 후 교체 → 워커가 중간에 죽어도 깨진 JSON이 남지 않음
+            write_bytes_atomic(path, payload)
             logger.debug(f"Fallback 저장: {path}")
         except Exception as e:
             logger.warning(f"Fallback 저장 실패: {e}")
@@ -203,10 +301,9 @@ class SeatRepository:
             safe_filename = cache_key.replace(':', '_')
             path = self.fallback_dir / f"{safe_filename}.json"
             if path.exists():
-                with open(path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    logger.info(f"Fallback 로드 성공: {path}")
-                    return data
+                data = orjson.loads(path.read_bytes())
+                logger.info(f"Fallback 로드 성공: {path}")
+                return data
         except Exception as e:
             logger.warning(f"Fallback 로드 실패: {e}")
         return []
@@ -1,12 +1,113 @@
 """Supabase client wrapper for CCTV seat detection system."""
+import asyncio
+import functools
+import logging
 import os
-from typing import Optional, Dict, List, Any
+import queue
+import random
+import threading
+import time
+from threading import Lock
+from typing import Callable, Optional, Dict, List, Any, Tuple
 from datetime import datetime
-from supabase import create_client, Client
+
+import httpx
+from postgrest.exceptions import APIError
+from supabase import acreate_client, create_client, AsyncClient, Client
+from supabase.lib.client_options import ClientOptions
 from dotenv import load_dotenv
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Rows per bulk insert/upsert request (keeps payloads under PostgREST limits)
+BULK_BATCH_SIZE = 500
+
+# Store/seat configuration changes rarely; cache those reads briefly
+READ_CACHE_TTL = 30.0
+
+# Background log writer: rows are collected for up to LOG_FLUSH_INTERVAL
+# seconds and inserted LOG_BATCH_SIZE at a time; beyond LOG_QUEUE_SIZE
+# pending rows new ones are dropped
+LOG_FLUSH_INTERVAL = 1.0
+LOG_BATCH_SIZE = 500
+LOG_QUEUE_SIZE = 10000
+
+# Retries for rate limiting (429) and server errors, with jittered backoff
+RETRY_ATTEMPTS = 5
+RETRY_BASE_DELAY = 0.2
+RETRY_MAX_DELAY = 5.0
+
+
+class BulkWriteError(Exception):
+    """A batched write failed part-way through.
+
+    Attributes:
+        completed: Rows returned by the batches that succeeded
+        start: Index of the first row of the failed batch
+        size: Number of rows in the failed batch
+    """
+
+    def __init__(self, action: str, completed: List[Dict[str, Any]], start: int, size: int, cause: Exception):
+        super().__init__(
+            f"Failed to {action}: batch of {size} rows from index {start} ({cause}); "
+            f"{len(completed)} rows written before it"
+        )
+        self.completed = completed
+        self.start = start
+        self.size = size
+
+
+def _is_retryable(error: Exception, idempotent: bool) -> bool:
+    """Whether a failed request may be sent again.
+
+    429 and connection failures mean the request was not applied, so any
+    call can be retried. Timeouts and 5xx responses may have been applied,
+    so only idempotent calls (reads, upserts) are retried on those, which
+    keeps plain inserts from being duplicated.
+    """
+    if isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)):
+        return True
+    if isinstance(error, httpx.TransportError):
+        return idempotent
+
+    if isinstance(error, APIError):
+        status = error.code
+    elif isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+    else:
+        return False
+    try:
+        status = int(status)
+    except (TypeError, ValueError):
+        return False  # PostgREST/Postgres error code, e.g. a constraint violation
+    return status == 429 or (idempotent and 500 <= status < 600)
+
+
+def _call_with_retry(fn: Callable[[], Any], idempotent: bool = True) -> Any:
+    """Call ``fn``, retrying retryable Supabase errors with exponential backoff."""
+    for attempt in range(RETRY_ATTEMPTS):
+        try:
+            return fn()
+        except Exception as e:
+            if attempt == RETRY_ATTEMPTS - 1 or not _is_retryable(e, idempotent):
+                raise
+            delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt)
+            delay *= random.uniform(0.5, 1.0)
+            logger.warning("Supabase request failed (%s), retrying in %.2fs", e, delay)
+            time.sleep(delay)
+
+
+def _retryable(idempotent: bool = True):
+    """Decorator form of _call_with_retry()."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            return _call_with_retry(lambda: fn(*args, **kwargs), idempotent)
+        return wrapper
+    return decorator
+
 
 class SupabaseClient:
     """Supabase client wrapper with convenience methods."""
@@ -27,7 +128,73 @@ class SupabaseClient:
                 "or SUPABASE_KEY must be set in environment"
             )
 
-        self.client: Client = create_client(url, key)
+        # One pooled keep-alive HTTP client for all PostgREST calls
+        self._http_client = httpx.Client(
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+            timeout=httpx.Timeout(10.0, connect=3.0),
+            http2=True
+        )
+        try:
+            options = ClientOptions(httpx_client=self._http_client)
+        except TypeError:
+            # Older supabase releases take no httpx_client; their PostgREST
+            # session is still reused across requests
+            self._http_client.close()
+            self._http_client = None
+            options = None
+
+        if options is not None:
+            self.client: Client = create_client(url, key, options=options)
+        else:
+            self.client: Client = create_client(url, key)
+
+        # Realtime is only implemented by the async client; created on the
+        # first subscription (see _get_realtime_client)
+        self._url = url
+        self._key = key
+        self._async_client: Optional[AsyncClient] = None
+        self._async_client_lock = asyncio.Lock()
+
+        # (kind, *args) -> (timestamp, data); only store/seat config reads,
+        # never status/event data which must stay real-time
+        self._read_cache: Dict[Tuple, Tuple[float, Any]] = {}
+        self._read_cache_lock = Lock()
+
+        # (table, row) pairs written by a background thread, started on first use
+        self._log_queue: "queue.Queue[Tuple[str, Dict[str, Any]]]" = queue.Queue(
+            maxsize=LOG_QUEUE_SIZE
+        )
+        self._log_thread: Optional[threading.Thread] = None
+        self._log_thread_lock = Lock()
+
+    def _cached(self, key: Tuple, fetch: Callable[[], Any]) -> Any:
+        """Return a cached read result younger than READ_CACHE_TTL, else fetch it."""
+        entry = self._read_cache.get(key)
+        if entry is not None and time.time() - entry[0] < READ_CACHE_TTL:
+            return entry[1]
+        data = fetch()
+        with self._read_cache_lock:
+            self._read_cache[key] = (time.time(), data)
+        return data
+
+    def _invalidate_seats(self, store_id: Optional[str]) -> None:
+        """Drop cached seat reads after a seat write."""
+        self._invalidate('seats', store_id)
+        self._invalidate('seat', store_id)
+
+    def _invalidate(self, kind: str, store_id: Optional[str] = None) -> None:
+        """Drop cached reads of one kind, optionally only for one store."""
+        with self._read_cache_lock:
+            for key in list(self._read_cache):
+                if key[0] == kind and (store_id is None or key[1] == store_id):
+                    del self._read_cache[key]
+
+    def close(self) -> None:
+        """Write pending log rows and close pooled HTTP connections."""
+        self.flush_logs()
+        if self._http_client is not None:
+            self._http_client.close()
+            self._http_client = None
 
     # ============================================================================
     # Store Operations
@@ -35,20 +202,25 @@ class SupabaseClient:
 
     def get_store(self, store_id: str) -> Optional[Dict[str, Any]]:
         """Get store information."""
-        response = self.client.table('stores').select('*').eq('store_id', store_id).execute()
-        return response.data[0] if response.data else None
+        def fetch():
+            response = self.client.table('stores').select('*').eq('store_id', store_id).execute()
+            return response.data[0] if response.data else None
+        return self._cached(('store', store_id), fetch)
 
     def list_stores(self, active_only: bool = True) -> List[Dict[str, Any]]:
         """List all stores."""
-        query = self.client.table('stores').select('*')
-        if active_only:
-            query = query.eq('is_active', True)
-        response = query.execute()
-        return response.data
+        def fetch():
+            query = self.client.table('stores').select('*')
+            if active_only:
+                query = query.eq('is_active', True)
+            return query.execute().data
+        return self._cached(('stores', active_only), fetch)
 
     def create_store(self, store_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new store."""
         response = self.client.table('stores').insert(store_data).execute()
+        self._invalidate('store', store_data.get('store_id'))
+        self._invalidate('stores')
         if not response.data:
             raise ValueError(f"Failed to create store: {store_data.get('store_id')}")
         return response.data[0]
@@ -59,30 +231,75 @@ class SupabaseClient:
 
     def get_seats(self, store_id: str, active_only: bool = True) -> List[Dict[str, Any]]:
         """Get all seats for a store."""
-        query = self.client.table('seats').select('*').eq('store_id', store_id)
-        if active_only:
-            query = query.eq('is_active', True)
-        response = query.execute()
-        return response.data
-
-    def get_seat(self, store_id: str, seat_id: str) -> Optional[Dict[str, Any]]:
-        """Get a specific seat."""
+        def fetch():
+            query = self.client.table('seats').select('*').eq('store_id', store_id)
+            if active_only:
+                query = query.eq('is_active', True)
+            return query.execute().data
+        return self._cached(('seats', store_id, active_only), fetch)
+
+    def list_seat_ids(self, store_id: str) -> set:
+        """Get ids of all seats in a store, active or not (not cached)."""
         response = (
             self.client.table('seats')
-            .select('*')
+            .select('seat_id')
             .eq('store_id', store_id)
-            .eq('seat_id', seat_id)
             .execute()
         )
-        return response.data[0] if response.data else None
+        return {row['seat_id'] for row in response.data or []}
 
+    def get_seat(self, store_id: str, seat_id: str) -> Optional[Dict[str, Any]]:
+        """Get a specific seat."""
+        def fetch():
+            response = (
+                self.client.table('seats')
+                .select('*')
+                .eq('store_id', store_id)
+                .eq('seat_id', seat_id)
+                .execute()
+            )
+            return response.data[0] if response.data else None
+        return self._cached(('seat', store_id, seat_id), fetch)
+
+    @_retryable(idempotent=False)
     def create_seat(self, seat_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new seat."""
         response = self.client.table('seats').insert(seat_data).execute()
+        self._invalidate_seats(seat_data.get('store_id'))
         if not response.data:
             raise ValueError(f"Failed to create seat: {seat_data.get('seat_id')}")
         return response.data[0]
 
+    def create_seats_bulk(
+        self,
+        seats: List[Dict[str, Any]],
+        batch_size: int = BULK_BATCH_SIZE
+    ) -> List[Dict[str, Any]]:
+        """Create many seats, one insert request per ``batch_size`` rows.
+
+        Returns:
+            The created rows
+
+        Raises:
+            BulkWriteError: A batch failed; earlier batches stay committed
+                and their rows are in ``completed``
+        """
+        created = []
+        for start in range(0, len(seats), batch_size):
+            batch = seats[start:start + batch_size]
+            try:
+                response = _call_with_retry(
+                    self.client.table('seats').insert(batch).execute, idempotent=False
+                )
+                if not response.data:
+                    raise ValueError("no rows returned")
+            except Exception as e:
+                raise BulkWriteError("create seats", created, start, len(batch), e) from e
+            finally:
+                self._invalidate_seats(batch[0].get('store_id'))
+            created.extend(response.data)
+        return created
+
     def update_seat_roi(
         self,
         store_id: str,
@@ -101,6 +318,7 @@ class SupabaseClient:
             .eq('seat_id', seat_id)
             .execute()
         )
+        self._invalidate_seats(store_id)
         if not response.data:
             raise ValueError(f"Failed to update ROI for seat: {store_id}/{seat_id}")
         return response.data[0]
@@ -120,16 +338,22 @@ class SupabaseClient:
         )
         return response.data[0] if response.data else None
 
-    def get_all_seat_statuses(self, store_id: str) -> List[Dict[str, Any]]:
-        """Get status of all seats in a store."""
+    def get_all_seat_statuses(self, store_id: str, columns: str = '*') -> List[Dict[str, Any]]:
+        """Get status of all seats in a store.
+
+        Args:
+            store_id: Store identifier
+            columns: Comma-separated columns to select (default: all)
+        """
         response = (
             self.client.table('seat_status')
-            .select('*')
+            .select(columns)
             .eq('store_id', store_id)
             .execute()
         )
         return response.data
 
+    @_retryable()
     def update_seat_status(
         self,
         store_id: str,
@@ -150,6 +374,29 @@ class SupabaseClient:
             raise ValueError(f"Failed to update status for seat: {store_id}/{seat_id}")
         return response.data[0]
 
+    def upsert_seat_statuses_bulk(
+        self,
+        statuses: List[Dict[str, Any]],
+        batch_size: int = BULK_BATCH_SIZE
+    ) -> List[Dict[str, Any]]:
+        """Upsert many seat status rows (each with store_id and seat_id) in batches.
+
+        Raises:
+            BulkWriteError: A batch failed; earlier batches stay committed
+                and their rows are in ``completed``
+        """
+        upserted = []
+        for start in range(0, len(statuses), batch_size):
+            batch = statuses[start:start + batch_size]
+            try:
+                response = _call_with_retry(self.client.table('seat_status').upsert(batch).execute)
+                if not response.data:
+                    raise ValueError("no rows returned")
+            except Exception as e:
+                raise BulkWriteError("upsert seat statuses", upserted, start, len(batch), e) from e
+            upserted.extend(response.data)
+        return upserted
+
     def get_vacant_seats(
         self,
         store_id: str,
@@ -182,6 +429,7 @@ class SupabaseClient:
     # Detection Event Operations
     # ============================================================================
 
+    @_retryable(idempotent=False)
     def log_detection_event(self, event_data: Dict[str, Any]) -> Dict[str, Any]:
         """Log a detection event."""
         response = self.client.table('detection_events').insert(event_data).execute()
@@ -247,6 +495,7 @@ class SupabaseClient:
         response = query.order('hour_slot', desc=True).execute()
         return response.data
 
+    @_retryable()
     def upsert_hourly_stat(self, stat_data: Dict[str, Any]) -> Dict[str, Any]:
         """Upsert hourly occupancy statistic."""
         response = self.client.table('occupancy_stats').upsert(stat_data).execute()
@@ -258,31 +507,73 @@ class SupabaseClient:
     # Real-time Subscriptions
     # ============================================================================
 
-    def subscribe_seat_status(self, store_id: str, callback):
+    async def _get_realtime_client(self) -> AsyncClient:
+        """Get or create the async client used for realtime channels."""
+        async with self._async_client_lock:
+            if self._async_client is None:
+                self._async_client = await acreate_client(self._url, self._key)
+        return self._async_client
+
+    async def subscribe_store(
+        self,
+        store_id: str,
+        on_status: Optional[Callable] = None,
+        on_event: Optional[Callable] = None
+    ):
+        """Subscribe to a store's seat status updates and detection events.
+
+        Both feeds share one realtime channel, and rows are filtered by
+        store_id on the server, so other stores' changes are never sent.
+        Callbacks run on the event loop the subscription was made from.
+
+        Args:
+            store_id: Store ID to monitor
+            on_status: Called on seat_status UPDATE, signature: on_status(payload)
+            on_event: Called on detection_events INSERT, signature: on_event(payload)
+
+        Returns:
+            The subscribed realtime channel (``await channel.unsubscribe()``
+            to stop)
+        """
+        client = await self._get_realtime_client()
+        store_filter = f'store_id=eq.{store_id}'
+        channel = client.channel(f'store-{store_id}')
+        if on_status is not None:
+            channel.on_postgres_changes(
+                event='UPDATE', schema='public', table='seat_status',
+                filter=store_filter, callback=on_status
+            )
+        if on_event is not None:
+            channel.on_postgres_changes(
+                event='INSERT', schema='public', table='detection_events',
+                filter=store_filter, callback=on_event
+            )
+        await channel.subscribe()
+        return channel
+
+    async def subscribe_seat_status(self, store_id: str, callback):
         """Subscribe to seat status changes for a store.
 
+        Prefer subscribe_store() when also listening for events, to share
+        one channel.
+
         Args:
             store_id: Store ID to monitor
             callback: Function to call on updates, signature: callback(payload)
         """
-        def filter_callback(payload):
-            if payload['new'].get('store_id') == store_id:
-                callback(payload)
-
-        self.client.table('seat_status').on('UPDATE', filter_callback).subscribe()
+        return await self.subscribe_store(store_id, on_status=callback)
 
-    def subscribe_detection_events(self, store_id: str, callback):
+    async def subscribe_detection_events(self, store_id: str, callback):
         """Subscribe to detection events for a store.
 
+        Prefer subscribe_store() when also listening for status changes, to
+        share one channel.
+
         Args:
             store_id: Store ID to monitor
             callback: Function to call on new events, signature: callback(payload)
         """
-        def filter_callback(payload):
-            if payload['new'].get('store_id') == store_id:
-                callback(payload)
-
-        self.client.table('detection_events').on('INSERT', filter_callback).subscribe()
+        return await self.subscribe_store(store_id, on_event=callback)
 
     # ============================================================================
     # System Logs
@@ -296,14 +587,69 @@ class SupabaseClient:
         message: str,
         metadata: Optional[Dict[str, Any]] = None
     ):
-        """Log system event."""
-        self.client.table('system_logs').insert({
+        """Log system event (written in the background, see flush_logs)."""
+        self._queue_log('system_logs', {
             'store_id': store_id,
             'log_level': log_level,
             'component': component,
             'message': message,
             'metadata': metadata
-        }).execute()
+        })
+
+    def _queue_log(self, table: str, row: Dict[str, Any]) -> None:
+        """Queue a row for the background log writer."""
+        if self._log_thread is None:
+            with self._log_thread_lock:
+                if self._log_thread is None:
+                    self._log_thread = threading.Thread(
+                        target=self._log_flush_loop, name="supabase-log-writer", daemon=True
+                    )
+                    self._log_thread.start()
+        try:
+            self._log_queue.put_nowait((table, row))
+        except queue.Full:
+            logger.warning("Log queue full, dropping %s row", table)
+
+    def _drain_log_queue(self, limit: int) -> List[Tuple[str, Dict[str, Any]]]:
+        items = []
+        while len(items) < limit:
+            try:
+                items.append(self._log_queue.get_nowait())
+            except queue.Empty:
+                break
+        return items
+
+    def _write_logs(self, items: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """Insert queued rows with one request per table."""
+        by_table: Dict[str, List[Dict[str, Any]]] = {}
+        for table, row in items:
+            by_table.setdefault(table, []).append(row)
+        try:
+            for table, rows in by_table.items():
+                try:
+                    _call_with_retry(self.client.table(table).insert(rows).execute, idempotent=False)
+                except Exception as e:
+                    logger.warning("Failed to write %d %s rows: %s", len(rows), table, e)
+        finally:
+            for _ in items:
+                self._log_queue.task_done()
+
+    def _log_flush_loop(self) -> None:
+        while True:
+            first = self._log_queue.get()
+            # Let more rows accumulate, then write them in one request
+            time.sleep(LOG_FLUSH_INTERVAL)
+            self._write_logs([first] + self._drain_log_queue(LOG_BATCH_SIZE - 1))
+
+    def flush_logs(self) -> None:
+        """Write all queued log rows now and wait until they are stored."""
+        while True:
+            items = self._drain_log_queue(LOG_BATCH_SIZE)
+            if not items:
+                break
+            self._write_logs(items)
+        # Rows the background thread already picked up
+        self._log_queue.join()
 
     # ============================================================================
     # Views (Read-only)
@@ -329,6 +675,17 @@ class SupabaseClient:
         )
         return response.data[0] if response.data else None
 
+    def get_store_dashboard(self, store_id: str) -> Optional[Dict[str, Any]]:
+        """Get occupancy summary and all seat statuses in one round-trip.
+
+        Calls the get_store_dashboard RPC (see API_CONTRACT.md).
+
+        Returns:
+            {"summary": {...} | None, "statuses": [...]}
+        """
+        response = self.client.rpc('get_store_dashboard', {'p_store_id': store_id}).execute()
+        return response.data
+
 
 # Singleton instance
 _supabase_client: Optional[SupabaseClient] = None
@@ -342,6 +699,14 @@ def get_supabase_client() -> SupabaseClient:
     return _supabase_client
 
 
+def close_supabase_client() -> None:
+    """Close the singleton's connections (e.g. at the end of a script)."""
+    global _supabase_client
+    if _supabase_client is not None:
+        _supabase_client.close()
+        _supabase_client = None
+
+
 # Example usage
 if __name__ == "__main__":
     import sys
@@ -85,7 +85,7 @@ def main():
             print(f"    Confidence: {conf:.2%}")
 
     # Load ROI matcher
-    matcher = ROIMatcher(config_path)
+    matcher = ROIMatcher(config)
 
     # Check each seat's polygon
     print("\n" + "=" * 80)
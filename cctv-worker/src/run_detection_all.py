@@ -1,14 +1,18 @@
 """Run detection on all configured channels and show occupancy summary."""
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-import json
+from typing import List
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.config import settings
-from src.utils import RTSPClient
-from src.core import PersonDetector, ROIMatcher
+from src.utils import RTSPClient, configure_opencv, probe_rtsp
+from src.core import PersonDetector, ROIMatcher, load_roi_matcher
+
+# Frames per YOLO forward pass
+INFERENCE_BATCH_SIZE = 8
 
 
 def get_rtsp_url_for_channel(channel_id: int) -> str:
@@ -25,90 +29,126 @@ def get_config_path_for_channel(channel_id: int) -> Path:
     return settings.ROI_CONFIG_DIR / f"channel_{channel_id:02d}.json"
 
 
-def run_detection_on_channel(channel_id: int, detector: PersonDetector):
-    """Run detection on a single channel."""
-    config_path = get_config_path_for_channel(channel_id)
+def _error_result(channel_id: int, total_seats: int, error: str) -> dict:
+    return {
+        'channel': channel_id,
+        'status': 'error',
+        'error': error,
+        'total_seats': total_seats,
+        'occupied': 0
+    }
 
-    if not config_path.exists():
-        return None
 
-    # Load config to get seat count
-    with open(config_path, 'r') as f:
-        config = json.load(f)
+def capture_channel_frame(channel_id: int):
+    """Load a channel's ROI matcher and grab one frame from its stream.
 
-    total_seats = len(config.get('seats', []))
+    I/O only (no inference), so it is safe to run for many channels in
+    parallel threads.
 
-    # Connect to RTSP
+    Returns:
+        (matcher, frame, error) - frame is None and error is set on failure
+    """
+    # Parsed once and reused until the file changes
+    matcher = load_roi_matcher(get_config_path_for_channel(channel_id))
+    if matcher is None:
+        return ROIMatcher(), None, 'ROI config not found'
+
+    # Skip offline cameras without waiting out the full connect timeout
     rtsp_url = get_rtsp_url_for_channel(channel_id)
+    if not probe_rtsp(rtsp_url):
+        return matcher, None, 'RTSP stream not responding'
+
+    # Connect to RTSP
     client = RTSPClient(rtsp_url)
 
     try:
         if not client.connect(timeout=10):
-            return {
-                'channel': channel_id,
-                'status': 'error',
-                'error': 'Failed to connect to RTSP',
-                'total_seats': total_seats,
-                'occupied': 0
-            }
+            return matcher, None, 'Failed to connect to RTSP'
 
         # Capture frame
         frame = client.capture_frame()
         if frame is None:
-            return {
-                'channel': channel_id,
-                'status': 'error',
-                'error': 'Failed to capture frame',
-                'total_seats': total_seats,
-                'occupied': 0
-            }
-
-        # Detect persons
-        detections = detector.detect_persons(frame)
-
-        # Load ROI matcher
-        matcher = ROIMatcher(config_path)
-
-        # Check occupancy
-        occupancy = matcher.check_occupancy(detections, iou_threshold=settings.IOU_THRESHOLD)
-
-        # Count occupied seats
-        occupied_count = sum(1 for seat_info in occupancy.values() if seat_info['status'] == 'occupied')
-
-        # Get seat details
-        seat_details = []
-        for seat_id, info in occupancy.items():
-            seat_details.append({
-                'id': seat_id,
-                'label': info['label'],
-                'status': info['status'],
-                'match': info['max_iou']
-            })
-
-        return {
-            'channel': channel_id,
-            'status': 'success',
-            'total_seats': total_seats,
-            'occupied': occupied_count,
-            'empty': total_seats - occupied_count,
-            'persons_detected': len(detections),
-            'seats': seat_details
-        }
+            return matcher, None, 'Failed to capture frame'
+        return matcher, frame, None
 
     except Exception as e:
-        return {
-            'channel': channel_id,
-            'status': 'error',
-            'error': str(e),
-            'total_seats': total_seats,
-            'occupied': 0
-        }
+        return matcher, None, str(e)
     finally:
         client.disconnect()
 
 
+def summarize_channel(channel_id: int, matcher: ROIMatcher, detections) -> dict:
+    """Match a channel's detections against its seats."""
+    total_seats = len(matcher.seats)
+
+    # Check occupancy
+    occupancy = matcher.check_occupancy(detections, iou_threshold=settings.IOU_THRESHOLD)
+
+    # Count occupied seats
+    occupied_count = sum(1 for seat_info in occupancy.values() if seat_info['status'] == 'occupied')
+
+    # Get seat details
+    seat_details = []
+    for seat_id, info in occupancy.items():
+        seat_details.append({
+            'id': seat_id,
+            'label': info['label'],
+            'status': info['status'],
+            'match': info['max_iou']
+        })
+
+    return {
+        'channel': channel_id,
+        'status': 'success',
+        'total_seats': total_seats,
+        'occupied': occupied_count,
+        'empty': total_seats - occupied_count,
+        'persons_detected': len(detections),
+        'seats': seat_details
+    }
+
+
+def run_detection_on_channels(channel_ids: List[int], detector: PersonDetector) -> List[dict]:
+    """Capture all channels concurrently, then detect on all frames in batches.
+
+    RTSP connect/capture is network-bound and releases the GIL, so every
+    channel's stream is opened at once. The captured frames then go through
+    YOLO together (up to INFERENCE_BATCH_SIZE per forward pass) instead of
+    one inference call per channel.
+    """
+    with ThreadPoolExecutor(max_workers=min(16, len(channel_ids))) as executor:
+        captures = list(executor.map(capture_channel_frame, channel_ids))
+
+    ok = [i for i, (_, frame, _) in enumerate(captures) if frame is not None]
+    detections = {}
+    for start in range(0, len(ok), INFERENCE_BATCH_SIZE):
+        batch = ok[start:start + INFERENCE_BATCH_SIZE]
+        try:
+            batch_detections = detector.detect_persons_batch([captures[i][1] for i in batch])
+        except Exception as e:
+            batch_detections = [e] * len(batch)
+        detections.update(zip(batch, batch_detections))
+
+    results = []
+    for i, (channel_id, (matcher, _, error)) in enumerate(zip(channel_ids, captures)):
+        total_seats = len(matcher.seats)
+        found = detections.get(i)
+        if error is not None:
+            results.append(_error_result(channel_id, total_seats, error))
+        elif isinstance(found, Exception):
+            results.append(_error_result(channel_id, total_seats, str(found)))
+        else:
+            try:
+                results.append(summarize_channel(channel_id, matcher, found))
+            except Exception as e:
+                results.append(_error_result(channel_id, total_seats, str(e)))
+    return results
+
+
 def main():
     """Run detection on all configured channels."""
+    configure_opencv(settings.OPENCV_NUM_THREADS)
+
     print("=" * 80)
     print("Running Detection on All Configured Channels")
     print("=" * 80)
@@ -134,19 +174,16 @@ def main():
     )
     print("✅ YOLO model loaded")
 
-    # Run detection on each channel
-    results = []
+    results = run_detection_on_channels(channels_with_config, detector)
+
     total_seats_all = 0
     total_occupied_all = 0
 
-    for channel_id in channels_with_config:
+    for channel_id, result in zip(channels_with_config, results):
         print(f"\n{'='*80}")
         print(f"Channel {channel_id}")
         print(f"{'='*80}")
 
-        result = run_detection_on_channel(channel_id, detector)
-        results.append(result)
-
         if result['status'] == 'success':
             total_seats_all += result['total_seats']
             total_occupied_all += result['occupied']
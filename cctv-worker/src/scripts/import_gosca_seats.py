@@ -7,7 +7,11 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from src.utils.gosca_client import GoScaClient
-from src.database.supabase_client import get_supabase_client
+from src.database.supabase_client import (
+    BulkWriteError,
+    get_supabase_client,
+    close_supabase_client,
+)
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -54,8 +58,22 @@ def import_store_and_seats(store_id: str):
     created_count = 0
     updated_count = 0
 
+    # One query for existing seat ids instead of a lookup per seat
+    existing_ids = supabase.list_seat_ids(store_data['store_id'])
+
+    # seat_id -> row; GoSca may list a seat twice, which would make the
+    # whole insert batch fail on the unique key
+    new_seats = {}
     for seat in gosca_seats:
-        seat_data = {
+        if seat['seat_id'] in existing_ids:
+            # Update if needed
+            updated_count += 1
+            continue
+        if seat['seat_id'] in new_seats:
+            print(f"   ⚠️  Duplicate seat in GoSca data, skipped: {seat['seat_id']}")
+            continue
+
+        new_seats[seat['seat_id']] = {
             'store_id': store_data['store_id'],
             'seat_id': seat['seat_id'],
             'chairtbl_id': seat['chairtbl_id'],
@@ -73,32 +91,38 @@ def import_store_and_seats(store_id: str):
             }
         }
 
+    created = []
+    if new_seats:
+        try:
+            created = supabase.create_seats_bulk(list(new_seats.values()))
+        except BulkWriteError as e:
+            created = e.completed
+            print(f"   ⚠️  Error importing seats: {e}")
+    created_count = len(created)
+
+    # Initialize seat status for every seat that has none yet, including
+    # seats left without one by an earlier, interrupted import
+    seat_ids = existing_ids | {seat['seat_id'] for seat in created}
+    with_status = {
+        row['seat_id']
+        for row in supabase.get_all_seat_statuses(store_data['store_id'], columns='seat_id')
+    }
+    missing_status = sorted(seat_ids - with_status)
+    if missing_status:
         try:
-            existing_seat = supabase.get_seat(
-                store_data['store_id'],
-                seat['seat_id']
-            )
-
-            if existing_seat:
-                # Update if needed
-                updated_count += 1
-            else:
-                supabase.create_seat(seat_data)
-                created_count += 1
-
-                # Initialize seat status
-                supabase.update_seat_status(
-                    store_data['store_id'],
-                    seat['seat_id'],
-                    {
-                        'status': 'empty',
-                        'person_detected': False,
-                        'object_detected': False,
-                        'vacant_duration_seconds': 0
-                    }
-                )
-        except Exception as e:
-            print(f"   ⚠️  Error importing seat {seat['seat_id']}: {e}")
+            supabase.upsert_seat_statuses_bulk([
+                {
+                    'store_id': store_data['store_id'],
+                    'seat_id': seat_id,
+                    'status': 'empty',
+                    'person_detected': False,
+                    'object_detected': False,
+                    'vacant_duration_seconds': 0
+                }
+                for seat_id in missing_status
+            ])
+        except BulkWriteError as e:
+            print(f"   ⚠️  Error initializing seat status: {e}")
 
     print(f"   ✓ Created: {created_count}, Updated: {updated_count}")
 
@@ -143,6 +167,8 @@ def main():
         import traceback
         traceback.print_exc()
         sys.exit(1)
+    finally:
+        close_supabase_client()
 
 
 if __name__ == "__main__":
@@ -1,9 +1,28 @@
-from .rtsp_client import RTSPClient
+from .rtsp_client import RTSPClient, probe_rtsp
+from .frame_cache import ChannelFrameCache
+from .cv_runtime import configure_opencv
+from .file_io import write_bytes_atomic
+from .jpeg_encoder import (
+    encode_jpeg,
+    encode_jpeg_buffer,
+    enable_nvjpeg,
+    check_opencv_jpeg_build,
+    get_jpeg_backend
+)
 from .logger import StructuredLogger, PerformanceMonitor
 from .detection_logger import DetectionLogger, create_detection_logger
 
 __all__ = [
     'RTSPClient',
+    'probe_rtsp',
+    'ChannelFrameCache',
+    'configure_opencv',
+    'write_bytes_atomic',
+    'encode_jpeg',
+    'encode_jpeg_buffer',
+    'enable_nvjpeg',
+    'check_opencv_jpeg_build',
+    'get_jpeg_backend',
     'StructuredLogger',
     'PerformanceMonitor',
     'DetectionLogger',
@@ -0,0 +1,29 @@
+"""Process-wide OpenCV runtime settings."""
+import logging
+
+import cv2
+
+logger = logging.getLogger(__name__)
+
+
+def configure_opencv(num_threads: int) -> int:
+    """Enable OpenCV's optimized code paths and cap its thread pool.
+
+    By default OpenCV starts one worker thread per logical core in every
+    process. With one process per channel (or a threadpool of requests)
+    that oversubscribes the CPU, so callers pin the count explicitly.
+    Call before the first OpenCV operation in the process.
+
+    Args:
+        num_threads: Threads for OpenCV's parallel_for (1 = run inline)
+
+    Returns:
+        Thread count reported by OpenCV afterwards
+    """
+    # Make sure OpenCV's SIMD (SSE4/AVX2/NEON) code paths are dispatched
+    cv2.setUseOptimized(True)
+    cv2.setNumThreads(max(int(num_threads), 1))
+
+    threads = cv2.getNumThreads()
+    logger.debug("OpenCV configured: optimized=%s threads=%d", cv2.useOptimized(), threads)
+    return threads
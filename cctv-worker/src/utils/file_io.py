@@ -0,0 +1,37 @@
+"""Crash-safe file writes."""
+import os
+import tempfile
+from pathlib import Path
+from typing import Union
+
+
+def write_bytes_atomic(path: Union[Path, str], data: bytes, mode: int = 0o644) -> None:
+    """Write a file via temp file + fsync + rename (blocking).
+
+    Readers (and a crash mid-write) only ever see the old or the new file,
+    never a truncated one. The temp file gets a unique name, so concurrent
+    writers of the same path don't clobber each other's temp file, and it
+    is removed if the write fails.
+
+    Args:
+        path: Destination file
+        data: File contents
+        mode: Permissions of the new file (mkstemp alone creates 0600)
+    """
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            os.fchmod(f.fileno(), mode)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
@@ -0,0 +1,229 @@
+"""Persistent per-channel RTSP readers serving the latest frame on demand."""
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from .rtsp_client import RTSPClient
+
+logger = logging.getLogger(__name__)
+
+
+class _ChannelReader:
+    """Background reader keeping one channel's newest frame in memory."""
+
+    def __init__(
+        self,
+        channel_id: int,
+        rtsp_url: str,
+        hw_accel: bool,
+        idle_timeout: float,
+        read_interval: float
+    ):
+        self.channel_id = channel_id
+        self.rtsp_url = rtsp_url
+        self.hw_accel = hw_accel
+        self.idle_timeout = idle_timeout
+        self.read_interval = read_interval
+
+        self.cond = threading.Condition()
+        self.frame: Optional[np.ndarray] = None
+        self.timestamp = 0.0
+        self.last_access = time.monotonic()
+        # Refresh at full stream rate until then (see wait_for_frame)
+        self.live_until = 0.0
+        self.connected = False
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(
+            target=self._run, name=f"frame-cache-ch{channel_id}", daemon=True
+        )
+
+    def is_alive(self) -> bool:
+        return self.thread.is_alive()
+
+    def _idle(self) -> bool:
+        return time.monotonic() - self.last_access > self.idle_timeout
+
+    def _run(self) -> None:
+        client = RTSPClient(self.rtsp_url, hw_accel=self.hw_accel)
+        logger.info("Frame cache reader started for channel %d", self.channel_id)
+
+        try:
+            while not self.stop_event.is_set() and not self._idle():
+                if not client.is_connected:
+                    self.connected = False
+                    client.disconnect()
+                    if not client.connect(timeout=10):
+                        logger.warning("Frame cache: failed to connect to channel %d", self.channel_id)
+                        self.stop_event.wait(5)
+                        continue
+                    client.start_grabber()
+                    self.connected = True
+
+                frame = client.latest_frame(timeout=5.0)
+                if frame is not None:
+                    with self.cond:
+                        self.frame = frame
+                        self.timestamp = time.monotonic()
+                        self.cond.notify_all()
+
+                # The grabber drains the stream; unless a live consumer is
+                # waiting, only convert a few frames/s
+                if time.monotonic() > self.live_until:
+                    self.stop_event.wait(self.read_interval)
+        finally:
+            client.disconnect()
+            self.connected = False
+            with self.cond:
+                self.frame = None
+                self.cond.notify_all()
+            logger.info("Frame cache reader stopped for channel %d", self.channel_id)
+
+
+class ChannelFrameCache:
+    """Keep RTSP connections open and hand out the latest frame per channel.
+
+    Each channel gets a background reader (RTSP connection + grabber) that
+    refreshes a single latest-frame slot a few times per second, so callers
+    get a recent frame without paying the RTSP handshake and keyframe wait.
+    Readers start on first use (or via start()) and stop after
+    ``idle_timeout`` seconds without requests, so NVR connections are not
+    held forever. Live consumers (e.g. the debug stream publishers) read
+    from the same reader via wait_for_frame(), so each channel has a
+    single NVR connection.
+    """
+
+    def __init__(
+        self,
+        url_for_channel: Callable[[int], str],
+        hw_accel: bool = False,
+        idle_timeout: float = 300.0,
+        read_interval: float = 0.2
+    ):
+        """Initialize frame cache.
+
+        Args:
+            url_for_channel: Builds the RTSP URL for a channel id
+            hw_accel: Request hardware video decoding
+            idle_timeout: Seconds without get_latest() before a reader stops
+            read_interval: Seconds between latest-frame refreshes
+        """
+        self.url_for_channel = url_for_channel
+        self.hw_accel = hw_accel
+        self.idle_timeout = idle_timeout
+        self.read_interval = read_interval
+
+        self._readers: Dict[int, _ChannelReader] = {}
+        self._lock = threading.Lock()
+
+    def _get_reader(self, channel_id: int) -> _ChannelReader:
+        """Get the channel's running reader, starting one if needed."""
+        with self._lock:
+            reader = self._readers.get(channel_id)
+            if reader is None or not reader.is_alive():
+                reader = _ChannelReader(
+                    channel_id,
+                    self.url_for_channel(channel_id),
+                    self.hw_accel,
+                    self.idle_timeout,
+                    self.read_interval
+                )
+                self._readers[channel_id] = reader
+                reader.thread.start()
+            reader.last_access = time.monotonic()
+            return reader
+
+    def start(self, channel_ids: Iterable[int]) -> None:
+        """Start readers for the given channels ahead of the first request."""
+        for channel_id in channel_ids:
+            self._get_reader(channel_id)
+
+    def stop(self) -> None:
+        """Stop all readers and release their connections."""
+        with self._lock:
+            readers = list(self._readers.values())
+            self._readers.clear()
+        for reader in readers:
+            reader.stop_event.set()
+        for reader in readers:
+            reader.thread.join(timeout=5.0)
+
+    def get_latest(
+        self,
+        channel_id: int,
+        max_age_s: float = 1.0,
+        timeout: float = 10.0,
+        copy: bool = True
+    ) -> Optional[np.ndarray]:
+        """Get the channel's most recent frame.
+
+        Readers store a new array for every frame and never write into it,
+        so callers that only read the frame can pass ``copy=False``.
+
+        Args:
+            channel_id: Channel number
+            max_age_s: Maximum accepted frame age in seconds
+            timeout: Seconds to wait for a fresh frame (e.g. while connecting)
+            copy: Return a private copy; pass False if the frame is not modified
+
+        Returns:
+            Frame as numpy array (BGR format) or None if none arrived in time
+        """
+        reader = self._get_reader(channel_id)
+
+        def is_fresh() -> bool:
+            return (
+                reader.frame is not None
+                and time.monotonic() - reader.timestamp <= max_age_s
+            )
+
+        with reader.cond:
+            reader.cond.wait_for(
+                lambda: is_fresh() or not reader.is_alive(), timeout=timeout
+            )
+            if not is_fresh():
+                return None
+            return reader.frame.copy() if copy else reader.frame
+
+    def wait_for_frame(
+        self,
+        channel_id: int,
+        after: float,
+        timeout: float = 5.0,
+        live_for: float = 1.0
+    ) -> Tuple[Optional[np.ndarray], float]:
+        """Wait for a frame newer than ``after``, for continuous consumers.
+
+        While called at least every ``live_for`` seconds the reader refreshes
+        at the stream's own rate instead of every ``read_interval``. The
+        returned frame is shared and must not be modified.
+
+        Args:
+            channel_id: Channel number
+            after: Timestamp of the last frame the caller got (0 for any)
+            timeout: Seconds to wait for a new frame
+            live_for: Seconds to keep the reader at full rate
+
+        Returns:
+            (frame, timestamp), or (None, after) if none arrived in time
+        """
+        reader = self._get_reader(channel_id)
+        reader.live_until = time.monotonic() + live_for
+
+        def is_new() -> bool:
+            return reader.frame is not None and reader.timestamp > after
+
+        with reader.cond:
+            reader.cond.wait_for(
+                lambda: is_new() or not reader.is_alive(), timeout=timeout
+            )
+            if not is_new():
+                return None, after
+            return reader.frame, reader.timestamp
+
+    def is_connected(self, channel_id: int) -> bool:
+        """Whether the channel's reader currently has an open RTSP stream."""
+        reader = self._readers.get(channel_id)
+        return reader is not None and reader.connected
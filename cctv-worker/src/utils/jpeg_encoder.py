@@ -0,0 +1,175 @@
+"""JPEG encoding with nvJPEG or libjpeg-turbo (PyTurboJPEG) when available."""
+import logging
+import threading
+from typing import Optional, Union
+
+import cv2
+import numpy as np
+
+try:
+    from turbojpeg import TurboJPEG, TJSAMP_420, TJFLAG_FASTDCT
+except ImportError:
+    TurboJPEG = None
+
+try:
+    from nvjpeg import NvJpeg
+except ImportError:
+    NvJpeg = None
+
+logger = logging.getLogger(__name__)
+
+_turbo: Optional["TurboJPEG"] = None
+_turbo_unavailable = TurboJPEG is None
+_turbo_lock = threading.Lock()
+
+# GPU encoding is opt-in (see enable_nvjpeg)
+_nvjpeg: Optional["NvJpeg"] = None
+_nvjpeg_lock = threading.Lock()
+# NvJpeg keeps encoder state and a CUDA stream per instance; not thread-safe
+_nvjpeg_encode_lock = threading.Lock()
+
+
+def _get_turbo() -> Optional["TurboJPEG"]:
+    """Get shared TurboJPEG instance, or None if libturbojpeg is missing."""
+    global _turbo, _turbo_unavailable
+    if _turbo is None and not _turbo_unavailable:
+        with _turbo_lock:
+            if _turbo is None and not _turbo_unavailable:
+                try:
+                    _turbo = TurboJPEG()
+                    logger.info("Using libjpeg-turbo for JPEG encoding")
+                except Exception as e:
+                    # Python package present but shared library not found
+                    logger.warning("TurboJPEG unavailable, falling back to OpenCV: %s", e)
+                    _turbo_unavailable = True
+    return _turbo
+
+
+def check_opencv_jpeg_build() -> bool:
+    """Check that OpenCV's JPEG codec is libjpeg-turbo built with SIMD.
+
+    Distro OpenCV packages are sometimes linked against plain libjpeg or a
+    non-SIMD build, which makes the cv2.imencode fallback several times
+    slower. Logs a warning in that case.
+
+    Returns:
+        True if OpenCV uses SIMD-enabled libjpeg-turbo
+    """
+    lines = [line.strip() for line in cv2.getBuildInformation().splitlines()]
+    jpeg_line = ""
+    simd_enabled = True
+    for i, line in enumerate(lines):
+        if line.startswith("JPEG:"):
+            jpeg_line = line
+            # Older builds don't report SIMD; only trust an explicit answer
+            for follow in lines[i + 1:i + 3]:
+                if follow.startswith("SIMD Support:"):
+                    simd_enabled = follow.split(":", 1)[1].strip() == "YES"
+            break
+
+    if "libjpeg-turbo" not in jpeg_line:
+        logger.warning(
+            "OpenCV JPEG codec is not libjpeg-turbo (%s); install opencv-python-headless "
+            "from PyPI for the SIMD encoder", jpeg_line or "not found"
+        )
+        return False
+    if not simd_enabled:
+        logger.warning("OpenCV libjpeg-turbo was built without SIMD (%s)", jpeg_line)
+        return False
+
+    logger.info("OpenCV JPEG codec: %s", jpeg_line.split(":", 1)[1].strip())
+    return True
+
+
+def enable_nvjpeg() -> bool:
+    """Encode on the GPU with nvJPEG for subsequent encode_jpeg calls.
+
+    Returns:
+        True if nvJPEG is active, False if unavailable (CPU encoding is kept)
+    """
+    global _nvjpeg
+    with _nvjpeg_lock:
+        if _nvjpeg is None:
+            if NvJpeg is None:
+                logger.warning("nvJPEG requested but pynvjpeg is not installed")
+                return False
+            try:
+                _nvjpeg = NvJpeg()
+                logger.info("Using nvJPEG for JPEG encoding")
+            except Exception as e:
+                # Package present but no CUDA device / driver
+                logger.warning("nvJPEG unavailable, using CPU encoding: %s", e)
+                return False
+    return True
+
+
+def get_jpeg_backend() -> str:
+    """Get the name of the encoder encode_jpeg() will use.
+
+    Returns:
+        "nvjpeg", "libjpeg-turbo" or "opencv"
+    """
+    if _nvjpeg is not None:
+        return "nvjpeg"
+    if _get_turbo() is not None:
+        return "libjpeg-turbo"
+    return "opencv"
+
+
+def encode_jpeg_buffer(image: np.ndarray, quality: int = 85) -> Union[bytes, memoryview]:
+    """Encode a BGR image to JPEG without copying the encoder's output.
+
+    Same as encode_jpeg(), but the OpenCV fallback returns a memoryview of
+    the encoded buffer instead of copying it into ``bytes``. Use when the
+    result is immediately copied anyway (e.g. joined into a response chunk).
+
+    Args:
+        image: Input image (BGR format)
+        quality: JPEG quality (0-100)
+
+    Returns:
+        Encoded JPEG as bytes or a bytes-like memoryview
+
+    Raises:
+        ValueError: If encoding fails
+    """
+    if _nvjpeg is not None:
+        try:
+            with _nvjpeg_encode_lock:
+                return _nvjpeg.encode(image, quality)
+        except Exception as e:
+            logger.debug("nvJPEG encode failed, using CPU encoder: %s", e)
+
+    turbo = _get_turbo()
+    if turbo is not None:
+        return turbo.encode(
+            image,
+            quality=quality,
+            jpeg_subsample=TJSAMP_420,
+            flags=TJFLAG_FASTDCT
+        )
+
+    success, buffer = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not success:
+        raise ValueError("Failed to encode image")
+    return memoryview(buffer).cast('B')
+
+
+def encode_jpeg(image: np.ndarray, quality: int = 85) -> bytes:
+    """Encode a BGR image to JPEG bytes.
+
+    Uses nvJPEG when enabled, then TurboJPEG (SIMD DCT, 4:2:0 subsampling,
+    fast DCT) when installed, otherwise falls back to cv2.imencode.
+
+    Args:
+        image: Input image (BGR format)
+        quality: JPEG quality (0-100)
+
+    Returns:
+        Encoded JPEG bytes
+
+    Raises:
+        ValueError: If encoding fails
+    """
+    # bytes() returns bytes objects as-is and copies only memoryviews
+    return bytes(encode_jpeg_buffer(image, quality))
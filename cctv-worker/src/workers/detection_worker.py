@@ -13,8 +13,19 @@ from dateutil import parser as date_parser
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from src.config import settings
-from src.utils import RTSPClient, StructuredLogger, PerformanceMonitor, create_detection_logger
+from src.config import (
+    settings,
+    EventType,
+    EVENT_TYPE_BY_STATUS,
+    ABANDONED_THRESHOLD_SECONDS,
+    RTSP_RECONNECT_DELAY,
+    RTSP_MAX_ERRORS,
+    DEFAULT_SNAPSHOT_INTERVAL,
+    LOG_PROGRESS_INTERVAL,
+)
+from src.utils import (
+    RTSPClient, StructuredLogger, PerformanceMonitor, create_detection_logger, configure_opencv
+)
 from src.core import PersonDetector, ROIMatcher
 from src.database.supabase_client import get_supabase_client
 from dotenv import load_dotenv
@@ -31,7 +42,7 @@ class ChannelWorker:
         channel_id: int,
         rtsp_url: str,
         stop_event: Event,
-        snapshot_interval: int = 3
+        snapshot_interval: int = DEFAULT_SNAPSHOT_INTERVAL
     ):
         """Initialize channel worker.
 
@@ -214,7 +225,7 @@ class ChannelWorker:
             if not person_detected and belongings_detected:
                 # Object without person - increment timer
                 self.abandoned_timers[seat_id] += self.snapshot_interval
-                if self.abandoned_timers[seat_id] >= 600:  # 10 minutes
+                if self.abandoned_timers[seat_id] >= ABANDONED_THRESHOLD_SECONDS:
                     new_status = 'abandoned'
             else:
                 # Reset timer
@@ -268,16 +279,9 @@ class ChannelWorker:
 
             # Log status change event (immediate, not batched)
             if new_status != prev_status:
-                event_type_map = {
-                    ('empty', 'occupied'): 'person_enter',
-                    ('occupied', 'empty'): 'person_leave',
-                    ('empty', 'abandoned'): 'abandoned_detected',
-                    ('occupied', 'abandoned'): 'abandoned_detected',
-                    ('abandoned', 'occupied'): 'person_enter',
-                    ('abandoned', 'empty'): 'item_removed'
-                }
-
-                event_type = event_type_map.get((prev_status, new_status), 'status_change')
+                event_type = EVENT_TYPE_BY_STATUS.get(
+                    (prev_status, new_status), EventType.STATUS_CHANGE.value
+                )
 
                 # Use DetectionLogger for status changes
                 if self.detection_logger:
@@ -312,6 +316,11 @@ class ChannelWorker:
     def run(self):
         """Main worker loop."""
         try:
+            # One process per channel already uses every core; a per-process
+            # OpenCV pool would oversubscribe (and a pool inherited across
+            # fork can deadlock), so keep OpenCV single-threaded here
+            configure_opencv(1)
+
             # Initialize in worker process
             if not self.initialize():
                 if self.logger:
@@ -328,7 +337,7 @@ class ChannelWorker:
             # Main loop
             frame_count = 0
             error_count = 0
-            max_errors = 10
+            max_errors = RTSP_MAX_ERRORS
 
             while not self.stop_event.is_set():
                 try:
@@ -351,7 +360,7 @@ class ChannelWorker:
                                 channel=self.channel_id
                             )
                             self.rtsp_client.disconnect()
-                            time.sleep(5)
+                            time.sleep(RTSP_RECONNECT_DELAY)
                             if not self.connect_rtsp():
                                 self.logger.critical(
                                     "Reconnection failed, exiting worker",
@@ -371,7 +380,7 @@ class ChannelWorker:
                     self.process_frame(frame)
 
                     # Log progress
-                    if frame_count % 20 == 0:
+                    if frame_count % LOG_PROGRESS_INTERVAL == 0:
                         occupied = sum(1 for s in self.previous_occupancy.values() if s == 'occupied')
                         total = len(self.previous_occupancy)
                         self.logger.debug(
@@ -447,6 +456,7 @@ class ChannelWorker:
                             'error_count': stats['error_count']
                         }
                     )
+                    self.db.flush_logs()
                 except Exception as e:
                     if self.logger:
                         self.logger.error("Failed to log final statistics", error=str(e))
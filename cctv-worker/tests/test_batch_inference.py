@@ -0,0 +1,55 @@
+"""Tests for batch inference server."""
+import threading
+
+import numpy as np
+import pytest
+
+from src.core.batch_inference import BatchInferenceServer
+
+
+class FakeDetector:
+    """Detector stub that records batch sizes."""
+
+    def __init__(self):
+        self.batch_sizes = []
+        self._lock = threading.Lock()
+
+    def detect_persons_batch(self, images):
+        with self._lock:
+            self.batch_sizes.append(len(images))
+        # Encode the frame's fill value into the detection to check ordering
+        return [[(0, 0, 10, 10, float(img[0, 0, 0]))] for img in images]
+
+
+class TestBatchInferenceServer:
+    """Test cases for BatchInferenceServer."""
+
+    def test_submit_returns_own_result(self):
+        """Each future resolves with the detections of its own frame."""
+        detector = FakeDetector()
+        server = BatchInferenceServer(detector, max_batch=4)
+        try:
+            futures = [
+                server.submit(i, np.full((4, 4, 3), i, dtype=np.uint8))
+                for i in range(6)
+            ]
+            results = [f.result(timeout=5) for f in futures]
+        finally:
+            server.stop()
+
+        assert [r[0][4] for r in results] == [float(i) for i in range(6)]
+        assert all(size <= 4 for size in detector.batch_sizes)
+
+    def test_detector_error_propagates(self):
+        """Exceptions from the detector are set on the futures."""
+        class FailingDetector:
+            def detect_persons_batch(self, images):
+                raise RuntimeError("boom")
+
+        server = BatchInferenceServer(FailingDetector())
+        try:
+            future = server.submit(1, np.zeros((4, 4, 3), dtype=np.uint8))
+            with pytest.raises(RuntimeError):
+                future.result(timeout=5)
+        finally:
+            server.stop()
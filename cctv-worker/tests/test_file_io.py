@@ -0,0 +1,68 @@
+"""Tests for crash-safe file writes."""
+import os
+import stat
+import threading
+
+import pytest
+
+from src.utils.file_io import write_bytes_atomic
+
+
+class TestWriteBytesAtomic:
+    """Test cases for write_bytes_atomic."""
+
+    def test_writes_and_replaces(self, tmp_path):
+        """The file is created, then replaced as a whole."""
+        path = tmp_path / "config.json"
+        write_bytes_atomic(path, b"old")
+        write_bytes_atomic(str(path), b"new")
+
+        assert path.read_bytes() == b"new"
+        assert os.listdir(tmp_path) == ["config.json"]
+
+    def test_mode(self, tmp_path):
+        """New files get the requested permissions, not mkstemp's 0600."""
+        path = tmp_path / "config.json"
+        write_bytes_atomic(path, b"{}")
+        write_bytes_atomic(tmp_path / "private.json", b"{}", mode=0o600)
+
+        assert stat.S_IMODE(path.stat().st_mode) == 0o644
+        assert stat.S_IMODE((tmp_path / "private.json").stat().st_mode) == 0o600
+
+    def test_failed_write_keeps_old_file(self, tmp_path, monkeypatch):
+        """A failure before the rename leaves the old file and no temp file."""
+        path = tmp_path / "config.json"
+        write_bytes_atomic(path, b"old")
+
+        def failing_fsync(fd):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(os, "fsync", failing_fsync)
+        with pytest.raises(OSError):
+            write_bytes_atomic(path, b"new")
+
+        assert path.read_bytes() == b"old"
+        assert os.listdir(tmp_path) == ["config.json"]
+
+    def test_concurrent_writers(self, tmp_path):
+        """Concurrent writers of one path never leave a mixed or partial file."""
+        path = tmp_path / "config.json"
+        payloads = [bytes([i]) * 100_000 for i in range(8)]
+        errors = []
+
+        def write(payload):
+            try:
+                for _ in range(10):
+                    write_bytes_atomic(path, payload)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=write, args=(p,)) for p in payloads]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert errors == []
+        assert path.read_bytes() in payloads
+        assert os.listdir(tmp_path) == ["config.json"]
@@ -0,0 +1,144 @@
+"""Tests for the persistent per-channel frame cache."""
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from src.utils import frame_cache as frame_cache_module
+from src.utils.frame_cache import ChannelFrameCache
+
+
+class FakeRTSPClient:
+    """RTSPClient stub producing numbered frames; records every instance."""
+
+    instances = []
+    connect_ok = True
+    max_frames = None  # stop producing frames after this many
+
+    def __init__(self, rtsp_url, hw_accel=False):
+        self.rtsp_url = rtsp_url
+        self.is_connected = False
+        self.frames = 0
+        self.disconnected = threading.Event()
+        FakeRTSPClient.instances.append(self)
+
+    def connect(self, timeout=10):
+        self.is_connected = self.connect_ok
+        return self.connect_ok
+
+    def start_grabber(self):
+        pass
+
+    def latest_frame(self, timeout=5.0):
+        time.sleep(0.005)
+        if self.max_frames is not None and self.frames >= self.max_frames:
+            return None
+        self.frames += 1
+        return np.full((4, 4, 3), self.frames, dtype=np.uint8)
+
+    def disconnect(self):
+        self.is_connected = False
+        self.disconnected.set()
+
+
+@pytest.fixture
+def fake_rtsp(monkeypatch):
+    FakeRTSPClient.instances = []
+    FakeRTSPClient.connect_ok = True
+    FakeRTSPClient.max_frames = None
+    monkeypatch.setattr(frame_cache_module, "RTSPClient", FakeRTSPClient)
+    return FakeRTSPClient
+
+
+@pytest.fixture
+def cache(fake_rtsp):
+    cache = ChannelFrameCache(lambda channel_id: f"rtsp://nvr/live_{channel_id:02d}", read_interval=0.01)
+    yield cache
+    cache.stop()
+
+
+class TestChannelFrameCache:
+    """Test cases for ChannelFrameCache."""
+
+    def test_get_latest_starts_reader(self, cache, fake_rtsp):
+        """The first request opens one reader for the channel's URL."""
+        frame = cache.get_latest(3, timeout=2)
+
+        assert frame is not None and frame.shape == (4, 4, 3)
+        assert [c.rtsp_url for c in fake_rtsp.instances] == ["rtsp://nvr/live_03"]
+        assert cache.is_connected(3)
+
+    def test_reader_is_shared(self, cache, fake_rtsp):
+        """Repeated requests and start() reuse the running reader."""
+        cache.start([1])
+        cache.get_latest(1, timeout=2)
+        cache.wait_for_frame(1, 0.0, timeout=2)
+
+        assert len(fake_rtsp.instances) == 1
+
+    def test_copy(self, cache):
+        """copy=True returns a private array, copy=False the shared one."""
+        assert cache.get_latest(1, timeout=2) is not None
+        reader = cache._readers[1]
+        # Holding the condition keeps the reader from publishing a new frame
+        with reader.cond:
+            shared = cache.get_latest(1, timeout=2, copy=False)
+            private = cache.get_latest(1, timeout=2)
+
+            assert shared is reader.frame
+            assert private is not reader.frame
+            assert np.array_equal(private, reader.frame)
+
+    def test_max_age(self, cache, fake_rtsp):
+        """Frames older than max_age_s are not returned."""
+        fake_rtsp.max_frames = 1
+        assert cache.get_latest(1, timeout=2) is not None
+        time.sleep(0.1)
+
+        assert cache.get_latest(1, max_age_s=0.05, timeout=0.1) is None
+        assert cache.get_latest(1, max_age_s=5.0, timeout=0.1) is not None
+
+    def test_timeout_when_connect_fails(self, cache, fake_rtsp):
+        """get_latest gives up after ``timeout`` if no frame arrives."""
+        fake_rtsp.connect_ok = False
+        start = time.monotonic()
+
+        assert cache.get_latest(1, timeout=0.2) is None
+        assert time.monotonic() - start < 2.0
+        assert not cache.is_connected(1)
+
+    def test_idle_reader_stops(self, fake_rtsp):
+        """A reader without requests for idle_timeout releases its connection."""
+        cache = ChannelFrameCache(lambda channel_id: "rtsp://nvr", idle_timeout=0.1, read_interval=0.01)
+        try:
+            assert cache.get_latest(1, timeout=2) is not None
+            assert fake_rtsp.instances[0].disconnected.wait(timeout=2)
+            cache._readers[1].thread.join(timeout=2)
+
+            # The next request starts a new reader
+            assert cache.get_latest(1, timeout=2) is not None
+            assert len(fake_rtsp.instances) == 2
+        finally:
+            cache.stop()
+
+    def test_wait_for_frame_returns_newer_frames(self, cache):
+        """Live consumers get strictly newer frames on every call."""
+        timestamps = []
+        after = 0.0
+        for _ in range(3):
+            frame, after = cache.wait_for_frame(1, after, timeout=2)
+            assert frame is not None
+            timestamps.append(after)
+
+        assert timestamps == sorted(set(timestamps))
+
+    def test_stop_disconnects(self, cache, fake_rtsp):
+        """stop() ends all readers and closes their connections."""
+        cache.start([1, 2])
+        cache.get_latest(1, timeout=2)
+        cache.get_latest(2, timeout=2)
+        cache.stop()
+
+        assert all(c.disconnected.is_set() for c in fake_rtsp.instances)
+        assert not cache.is_connected(1)
@@ -0,0 +1,21 @@
+"""Tests for JPEG encoder helper."""
+import cv2
+import numpy as np
+
+from src.utils.jpeg_encoder import encode_jpeg
+
+
+class TestEncodeJpeg:
+    """Test cases for encode_jpeg."""
+
+    def test_returns_jpeg_bytes(self):
+        """Encoded output is a decodable JPEG of the same size."""
+        image = np.zeros((48, 64, 3), dtype=np.uint8)
+        image[:, :32] = (0, 0, 255)
+
+        data = encode_jpeg(image, quality=80)
+
+        assert isinstance(data, bytes)
+        assert data[:2] == b'\xff\xd8'
+        decoded = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+        assert decoded.shape == image.shape
@@ -47,6 +47,17 @@ class TestROIMatcher:
         # IoU = 2500/17500 ≈ 0.143
         assert 0.14 < iou < 0.15
 
+    def test_calculate_iou_matrix_matches_pairwise(self):
+        """Test vectorized IoU matches the scalar implementation."""
+        seats = [(0, 0, 100, 100), (200, 200, 300, 300), (0, 0, 0, 0)]
+        persons = [(50, 50, 150, 150), (0, 0, 100, 100), (250, 250, 260, 400)]
+        matrix = ROIMatcher.calculate_iou_matrix(seats, persons)
+
+        assert matrix.shape == (3, 3)
+        for i, seat in enumerate(seats):
+            for j, person in enumerate(persons):
+                assert matrix[i, j] == pytest.approx(ROIMatcher.calculate_iou(seat, person))
+
     def test_point_in_polygon_inside(self):
         """Test point inside polygon."""
         polygon = [[0, 0], [100, 0], [100, 100], [0, 100]]
@@ -70,6 +81,26 @@ class TestROIMatcher:
         result = ROIMatcher.point_in_polygon(point, polygon)
         assert isinstance(result, bool)
 
+    def test_points_in_polygons_matches_scalar(self):
+        """Test vectorized point-in-polygon matches the scalar implementation."""
+        config = {
+            "camera_id": "test",
+            "resolution": [1920, 1080],
+            "seats": [
+                {"id": "A", "roi": [[0, 0], [100, 0], [100, 100], [0, 100]], "type": "polygon"},
+                {"id": "B", "roi": [[200, 0], [300, 50], [250, 150], [150, 80]], "type": "polygon"},
+            ]
+        }
+        matcher = ROIMatcher(config)
+        _, _, edges, offsets = matcher._get_poly_seats()
+        points = [(50, 50), (0, 50), (100, 100), (150, 150), (220, 60), (300, 50)]
+        inside = ROIMatcher.points_in_polygons(points, edges, offsets)
+
+        assert inside.shape == (2, len(points))
+        for row, seat in enumerate(config["seats"]):
+            for col, point in enumerate(points):
+                assert inside[row, col] == ROIMatcher.point_in_polygon(point, seat["roi"])
+
     def test_check_occupancy_empty(self, sample_roi_config):
         """Test occupancy check with no detections."""
         matcher = ROIMatcher(sample_roi_config)
@@ -89,6 +120,18 @@ class TestROIMatcher:
         assert results["A-01"]["status"] == "occupied"
         assert results["A-02"]["status"] == "empty"
 
+    def test_check_occupancy_with_array(self, sample_roi_config, sample_detections):
+        """Test (P, 5) array detections give the same statuses as tuples."""
+        import numpy as np
+
+        matcher = ROIMatcher(sample_roi_config)
+        expected = matcher.check_occupancy(sample_detections)
+        results = matcher.check_occupancy(np.asarray(sample_detections, dtype=np.float32))
+
+        for seat_id, info in expected.items():
+            assert results[seat_id]["status"] == info["status"]
+        assert isinstance(results["A-01"]["matched_detection"], tuple)
+
     def test_add_seat(self):
         """Test adding a new seat."""
         matcher = ROIMatcher()
@@ -0,0 +1,183 @@
+"""Tests for SeatRepository caching (fake Supabase client, no network)."""
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("supabase")
+
+from src.database.seat_repository import SeatRepository
+
+
+class FakeQuery:
+    """PostgREST query builder stub filtering in-memory rows."""
+
+    def __init__(self, db):
+        self.db = db
+        self.filters = {}
+
+    def select(self, columns):
+        self.columns = [c.strip() for c in columns.split(',')]
+        return self
+
+    def eq(self, column, value):
+        self.filters[column] = lambda v, value=value: v == value
+        return self
+
+    def in_(self, column, values):
+        self.filters[column] = lambda v, values=tuple(values): v in values
+        self.db.in_calls.append(list(values))
+        return self
+
+    def execute(self):
+        with self.db.lock:
+            self.db.queries += 1
+        time.sleep(self.db.delay)
+        if self.db.fail:
+            raise ConnectionError("supabase down")
+        rows = [
+            {c: row[c] for c in self.columns}
+            for row in self.db.rows
+            if all(match(row.get(column)) for column, match in self.filters.items())
+        ]
+        return type("Response", (), {"data": rows})()
+
+
+class FakeSupabase:
+    """Stands in for SupabaseClient; ``.client.table()`` returns FakeQuery."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = 0
+        self.in_calls = []
+        self.delay = 0.0
+        self.fail = False
+        self.lock = threading.Lock()
+        self.client = self
+
+    def table(self, name):
+        assert name == 'seats'
+        return FakeQuery(self)
+
+
+def _seat(seat_id, channel_id, store_id="store1", is_active=True):
+    return {
+        'store_id': store_id,
+        'seat_id': seat_id,
+        'channel_id': channel_id,
+        'is_active': is_active,
+        'roi_polygon': [[0.1, 0.1], [0.2, 0.1], [0.2, 0.2]],
+        'seat_label': seat_id,
+    }
+
+
+@pytest.fixture
+def db():
+    return FakeSupabase([
+        _seat("A-01", 1),
+        _seat("A-02", 1),
+        _seat("B-01", 2),
+        _seat("C-01", 3, is_active=False),
+        _seat("X-01", 1, store_id="store2"),
+    ])
+
+
+@pytest.fixture
+def repo(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(SeatRepository, "_cache", {})
+    monkeypatch.setattr(SeatRepository, "_key_locks", {})
+    repository = SeatRepository(fallback_dir=tmp_path)
+    repository._client = db
+    return repository
+
+
+class TestSeatRepositoryCache:
+    """Test cases for per-key cache refresh."""
+
+    def test_cache_hit_skips_query(self, repo, db):
+        first = repo.get_seats_by_channel("store1", 1)
+        second = repo.get_seats_by_channel("store1", 1)
+
+        assert [s['seat_id'] for s in first] == ["A-01", "A-02"]
+        assert second is first
+        assert db.queries == 1
+
+    def test_concurrent_refresh_queries_once(self, repo, db):
+        """Threads missing the same key wait for one Supabase query."""
+        db.delay = 0.05
+        results = []
+
+        def fetch():
+            results.append(repo.get_seats_by_channel("store1", 1))
+
+        threads = [threading.Thread(target=fetch) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert db.queries == 1
+        assert len(results) == 8
+        assert all(r is results[0] for r in results)
+
+    def test_expired_entry_is_refreshed(self, repo, db, monkeypatch):
+        repo.get_seats_by_channel("store1", 1)
+        monkeypatch.setattr(SeatRepository, "_cache_ttl", 0)
+
+        repo.get_seats_by_channel("store1", 1)
+
+        assert db.queries == 2
+
+
+class TestGetSeatsByChannels:
+    """Test cases for the multi-channel query."""
+
+    def test_one_query_split_per_channel(self, repo, db):
+        """Missing channels are fetched in one query and split by channel."""
+        result = repo.get_seats_by_channels("store1", [1, 2, 3])
+
+        assert db.queries == 1
+        assert db.in_calls == [[1, 2, 3]]
+        assert {ch: [s['seat_id'] for s in seats] for ch, seats in result.items()} == {
+            1: ["A-01", "A-02"],
+            2: ["B-01"],
+            3: [],
+        }
+        # Rows keep the single-channel shape (channel_id only used for grouping)
+        assert set(result[1][0]) == {'seat_id', 'roi_polygon', 'seat_label'}
+
+    def test_results_are_cached_per_channel(self, repo, db):
+        """Prefetched channels are then served to get_seats_by_channel from cache."""
+        prefetched = repo.get_seats_by_channels("store1", [1, 2])
+
+        assert repo.get_seats_by_channel("store1", 2) is prefetched[2]
+        assert db.queries == 1
+
+    def test_only_missing_channels_are_queried(self, repo, db):
+        cached = repo.get_seats_by_channel("store1", 1)
+
+        result = repo.get_seats_by_channels("store1", [1, 2])
+
+        assert db.in_calls == [[1], [2]]
+        assert result[1] is cached
+
+    def test_invalid_and_duplicate_channels(self, repo, db):
+        result = repo.get_seats_by_channels("store1", [2, 2, -1, "3"])
+
+        assert list(result) == [2]
+        assert db.in_calls == [[2]]
+        assert repo.get_seats_by_channels("", [1]) == {}
+
+    def test_failure_uses_stale_cache_then_fallback(self, repo, db, monkeypatch):
+        """On errors each channel falls back to its stale cache or its JSON file."""
+        repo.get_seats_by_channels("store1", [1, 2])
+        # Channel 2's cache entry is gone but its fallback file remains
+        SeatRepository._cache.pop("store1:2")
+        monkeypatch.setattr(SeatRepository, "_cache_ttl", 0)
+        db.fail = True
+
+        result = repo.get_seats_by_channels("store1", [1, 2, 3])
+
+        assert [s['seat_id'] for s in result[1]] == ["A-01", "A-02"]
+        assert [s['seat_id'] for s in result[2]] == ["B-01"]
+        assert result[3] == []
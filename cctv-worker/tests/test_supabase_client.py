@@ -0,0 +1,274 @@
+"""Tests for the Supabase client wrapper (no network, fake supabase clients)."""
+import asyncio
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("supabase")
+
+import httpx
+from postgrest.exceptions import APIError
+
+from src.database import supabase_client
+from src.database.supabase_client import SupabaseClient, _call_with_retry, _is_retryable
+
+
+class FakeChannel:
+    """Realtime channel stub that records its listeners."""
+
+    def __init__(self, name):
+        self.name = name
+        self.listeners = []
+        self.subscribed = False
+
+    def on_postgres_changes(self, event, callback, table="*", schema="public", filter=None):
+        self.listeners.append((event, table, filter, callback))
+        return self
+
+    async def subscribe(self):
+        self.subscribed = True
+        return self
+
+
+class FakeAsyncClient:
+    """Async supabase client stub handing out FakeChannels."""
+
+    def __init__(self):
+        self.channels = []
+
+    def channel(self, name):
+        channel = FakeChannel(name)
+        self.channels.append(channel)
+        return channel
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+
+class FakeInsert:
+    def __init__(self, table, rows):
+        self.table = table
+        self.rows = rows
+
+    def execute(self):
+        if self.table.fail:
+            raise ValueError("insert failed")
+        with self.table.client.lock:
+            self.table.client.inserts.append((self.table.name, self.rows))
+        return FakeResponse(self.rows if isinstance(self.rows, list) else [self.rows])
+
+
+class FakeTable:
+    def __init__(self, client, name):
+        self.client = client
+        self.name = name
+        self.fail = name in client.failing_tables
+
+    def insert(self, rows):
+        return FakeInsert(self, rows)
+
+
+class FakeSyncClient:
+    """Sync supabase client stub recording inserts per table."""
+
+    def __init__(self):
+        self.inserts = []
+        self.failing_tables = set()
+        self.lock = threading.Lock()
+
+    def table(self, name):
+        return FakeTable(self, name)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """SupabaseClient whose sync and async supabase clients are stubs."""
+    monkeypatch.setenv("SUPABASE_URL", "http://supabase.test")
+    monkeypatch.setenv("SUPABASE_SERVICE_ROLE_KEY", "test-key")
+    monkeypatch.setattr(supabase_client, "create_client", lambda *args, **kwargs: FakeSyncClient())
+
+    created = []
+
+    async def fake_acreate_client(url, key):
+        created.append((url, key))
+        return FakeAsyncClient()
+
+    monkeypatch.setattr(supabase_client, "acreate_client", fake_acreate_client)
+    instance = SupabaseClient()
+    instance.async_clients_created = created
+    yield instance
+    instance.close()
+
+
+class TestRealtimeSubscriptions:
+    """Test cases for subscribe_store and its wrappers."""
+
+    def test_subscribe_store_uses_one_filtered_channel(self, client):
+        """Both feeds share one subscribed channel filtered by store_id."""
+        on_status, on_event = object(), object()
+
+        channel = asyncio.run(client.subscribe_store("store1", on_status, on_event))
+
+        assert channel.name == "store-store1"
+        assert channel.subscribed
+        assert channel.listeners == [
+            ("UPDATE", "seat_status", "store_id=eq.store1", on_status),
+            ("INSERT", "detection_events", "store_id=eq.store1", on_event),
+        ]
+
+    def test_wrappers_reuse_the_async_client(self, client):
+        """Single-feed wrappers register one listener on the shared async client."""
+        async def subscribe_both():
+            status = await client.subscribe_seat_status("store1", print)
+            events = await client.subscribe_detection_events("store1", print)
+            return status, events
+
+        status, events = asyncio.run(subscribe_both())
+
+        assert [l[1] for l in status.listeners] == ["seat_status"]
+        assert [l[1] for l in events.listeners] == ["detection_events"]
+        assert client.async_clients_created == [("http://supabase.test", "test-key")]
+
+
+class TestBackgroundLogWriter:
+    """Test cases for the queued system log writer."""
+
+    @staticmethod
+    def _log(client, i, store_id="store1"):
+        client.log_system_event(store_id, "INFO", "test", f"message {i}")
+
+    @staticmethod
+    def _without_writer_thread(client):
+        """Keep the background writer from taking rows, so only flush_logs writes."""
+        client._log_thread = threading.Thread(target=lambda: None)
+
+    def test_flush_logs_drains_queue(self, client):
+        """flush_logs writes every queued row, batched per table."""
+        self._without_writer_thread(client)
+        for i in range(5):
+            self._log(client, i)
+        client._queue_log("detection_events", {"store_id": "store1"})
+
+        client.flush_logs()
+
+        rows = {table: [] for table, _ in client.client.inserts}
+        for table, batch in client.client.inserts:
+            rows[table].extend(batch)
+        assert [r["message"] for r in rows["system_logs"]] == [f"message {i}" for i in range(5)]
+        assert rows["detection_events"] == [{"store_id": "store1"}]
+        assert client._log_queue.empty()
+
+    def test_background_thread_writes(self, client, monkeypatch):
+        """Rows are written without flush_logs after LOG_FLUSH_INTERVAL."""
+        monkeypatch.setattr(supabase_client, "LOG_FLUSH_INTERVAL", 0.01)
+        self._log(client, 0)
+
+        deadline = time.monotonic() + 2.0
+        while not client.client.inserts and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert client.client.inserts[0][0] == "system_logs"
+
+    def test_full_queue_drops_rows(self, monkeypatch, client):
+        """Beyond LOG_QUEUE_SIZE pending rows new ones are dropped, not blocked on."""
+        monkeypatch.setattr(supabase_client, "LOG_QUEUE_SIZE", 3)
+        small = SupabaseClient()
+        self._without_writer_thread(small)
+        try:
+            for i in range(5):
+                self._log(small, i)
+            assert small._log_queue.qsize() == 3
+
+            small.flush_logs()
+            written = [row["message"] for _, batch in small.client.inserts for row in batch]
+            assert written == ["message 0", "message 1", "message 2"]
+        finally:
+            small.close()
+
+    def test_failed_insert_does_not_block_flush(self, client):
+        """A failing table is logged and skipped; flush_logs still returns."""
+        self._without_writer_thread(client)
+        client.client.failing_tables.add("system_logs")
+        self._log(client, 0)
+        client._queue_log("detection_events", {"store_id": "store1"})
+
+        client.flush_logs()
+
+        assert client.client.inserts == [("detection_events", [{"store_id": "store1"}])]
+        assert client._log_queue.empty()
+
+
+def _http_error(status):
+    request = httpx.Request("POST", "http://supabase.test/rest/v1/seat_status")
+    response = httpx.Response(status, request=request)
+    return httpx.HTTPStatusError("error", request=request, response=response)
+
+
+class TestRetry:
+    """Test cases for _is_retryable and _call_with_retry."""
+
+    @pytest.mark.parametrize("error, idempotent, expected", [
+        (httpx.ConnectError("refused"), False, True),
+        (httpx.PoolTimeout("pool"), False, True),
+        (httpx.ReadTimeout("slow"), True, True),
+        (httpx.ReadTimeout("slow"), False, False),
+        (APIError({"code": "429", "message": "rate limited"}), False, True),
+        (APIError({"code": "503", "message": "unavailable"}), True, True),
+        (APIError({"code": "503", "message": "unavailable"}), False, False),
+        (APIError({"code": "23505", "message": "duplicate key"}), True, False),
+        (APIError({"code": None, "message": "unknown"}), True, False),
+        (_http_error(429), False, True),
+        (_http_error(502), True, True),
+        (_http_error(400), True, False),
+        (ValueError("bad row"), True, False),
+    ])
+    def test_is_retryable(self, error, idempotent, expected):
+        assert _is_retryable(error, idempotent) is expected
+
+    @pytest.fixture
+    def sleeps(self, monkeypatch):
+        delays = []
+        monkeypatch.setattr(supabase_client.time, "sleep", delays.append)
+        return delays
+
+    def test_retries_rate_limit_with_backoff(self, sleeps):
+        """429s are retried with growing, capped delays until the call succeeds."""
+        results = iter([_http_error(429), _http_error(429), "ok"])
+
+        def call():
+            result = next(results)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        assert _call_with_retry(call, idempotent=False) == "ok"
+        assert len(sleeps) == 2
+        assert 0.5 * supabase_client.RETRY_BASE_DELAY <= sleeps[0] <= supabase_client.RETRY_BASE_DELAY
+        assert sleeps[1] <= 2 * supabase_client.RETRY_BASE_DELAY
+        assert all(d <= supabase_client.RETRY_MAX_DELAY for d in sleeps)
+
+    def test_non_retryable_error_raises_at_once(self, sleeps):
+        calls = []
+
+        def call():
+            calls.append(1)
+            raise APIError({"code": "23505", "message": "duplicate key"})
+
+        with pytest.raises(APIError):
+            _call_with_retry(call)
+        assert len(calls) == 1
+        assert sleeps == []
+
+    def test_gives_up_after_max_attempts(self, sleeps):
+        calls = []
+
+        def call():
+            calls.append(1)
+            raise _http_error(429)
+
+        with pytest.raises(httpx.HTTPStatusError):
+            _call_with_retry(call)
+        assert len(calls) == supabase_client.RETRY_ATTEMPTS
+        assert len(sleeps) == supabase_client.RETRY_ATTEMPTS - 1